@@ -0,0 +1,50 @@
+"""
+Times convert_jsonld_to_pydantic on generated graphs with many authors and
+parameters. Run from the repository root:
+
+    python -m benchmarks.convert_jsonld [--nodes 100 500 2000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from src.core.models import convert_jsonld_to_pydantic
+
+SDO = "http://schema.org/"
+SD = "https://w3id.org/okn/o/sd#"
+REPO = "https://github.com/foo/bar"
+
+
+def make_graph(size: int) -> list:
+    """A SoftwareSourceCode node with `size` authors and `size` parameters."""
+    people = [{"@id": f"https://github.com/user{i}", "@type": [SDO + "Person"],
+               SDO + "name": [{"@value": f"User {i}"}],
+               SDO + "affiliation": [{"@value": "EPFL"}]} for i in range(size)]
+    parameters = [{"@id": f"_:parameter{i}", "@type": [SD + "FormalParameter"],
+                   SDO + "name": [{"@value": f"input{i}"}],
+                   SD + "hasDimensionality": [{"@value": 3}]} for i in range(size)]
+    root = {
+        "@id": REPO, "@type": [SDO + "SoftwareSourceCode"],
+        SDO + "name": [{"@value": "bar"}],
+        SDO + "programmingLanguage": [{"@value": "Python"}],
+        SDO + "codeRepository": [{"@id": REPO}],
+        SDO + "author": [{"@id": person["@id"]} for person in people],
+        SD + "hasParameter": [{"@id": parameter["@id"]} for parameter in parameters],
+    }
+    return [root] + people + parameters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.nodes:
+        graph = make_graph(size)
+        number = max(1, 2000 // size)
+        best = min(timeit.repeat(lambda: convert_jsonld_to_pydantic(graph), number=number, repeat=args.repeat))
+        print(f"{size:>6} authors and parameters: {best / number * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,35 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from pydantic import BaseModel
+from typing import List
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
 from .core.gimie_methods import extract_gimie
-from .core.models import convert_jsonld_to_pydantic, convert_pydantic_to_zod_form_dict
 from .core.genai_model import llm_request_repo_infos
-from .utils.utils import merge_jsonld
+from .core.pipeline import extract_result, stream_llm_extraction, LLMServiceError
+from .core.results import OUTPUT_FORMATS
+from .core.jobs import JobManager, QueueFullError
+from .core.admission import AdmissionController, OverloadedError
+from .core.registry import warm_up
+from .core.batch import run_batch, BATCH_MAX_URLS, BATCH_WORKERS
 
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Precompute the schema, JSON-LD context and token encoder before serving requests
+    warm_up()
+    yield
+
+app = FastAPI(lifespan=lifespan)
+
+admission = AdmissionController()
+
+def extract_format(full_path: str, format: str):
+    # Every format is rendered from the same canonical result, computed once per commit
+    return extract_result(full_path).render(format)
 
 @app.get("/")
 def index():
@@ -17,48 +38,76 @@ def index():
 @app.get("/v1/extract/json/{full_path:path}")
 async def extract(full_path:str):
 
-    jsonld_gimie_data = extract_gimie(full_path, format="json-ld")
-
     try:
-        llm_result = llm_request_repo_infos(str(full_path))
-    except Exception as e:
+        zod_data = await admission.run(extract_format, full_path, "json")
+    except LLMServiceError as e:
         raise HTTPException(
             status_code=424, 
             detail=f"Error from LLM service: {e}"
         )
 
-    merged_results = merge_jsonld(jsonld_gimie_data, llm_result)
+    return {"link": full_path, 
+            "output": zod_data}
 
-    pydantic_data = convert_jsonld_to_pydantic(merged_results["@graph"])
+class BatchRequest(BaseModel):
+    urls: List[str]
+    format: str = "json-ld"
 
-    zod_data = convert_pydantic_to_zod_form_dict(pydantic_data)
+@app.post("/v1/extract/batch")
+async def extract_batch(request: BatchRequest):
+    if request.format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format: {request.format}")
+    if len(request.urls) > BATCH_MAX_URLS:
+        raise ValueError(f"A batch holds at most {BATCH_MAX_URLS} URLs")
 
-    return {"link": full_path, 
-            "output": zod_data}
+    # The batch reserves a slot per concurrent extraction, which run on the shared pool
+    workers = min(BATCH_WORKERS, len(request.urls)) or 1
+    outcomes = admission.stream(run_batch, request.urls, lambda url: extract_format(url, request.format),
+                                max_workers=workers, slots=workers, in_pool=False)
+
+    async def ndjson_stream():
+        try:
+            async for outcome in outcomes:
+                yield json.dumps(outcome) + "\n"
+        finally:
+            await outcomes.aclose()
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
 
 @app.get("/v1/extract/json-ld/{full_path:path}")
 async def extract(full_path:str):
 
-    jsonld_gimie_data = extract_gimie(full_path, format="json-ld")
-
     try:
-        llm_result = llm_request_repo_infos(str(full_path))
-    except Exception as e:
+        merged_results = await admission.run(extract_format, full_path, "json-ld")
+    except LLMServiceError as e:
         raise HTTPException(
             status_code=424, 
             detail=f"Error from LLM service: {e}"
         )
 
-    merged_results = merge_jsonld(jsonld_gimie_data, llm_result)
-
     return {"link": full_path, 
             "output": merged_results}
+
+@app.get("/v1/extract/turtle/{full_path:path}")
+async def extract_turtle(full_path:str):
+
+    try:
+        turtle = await admission.run(extract_format, full_path, "turtle")
+    except LLMServiceError as e:
+        raise HTTPException(
+            status_code=424, 
+            detail=f"Error from LLM service: {e}"
+        )
+
+    return PlainTextResponse(turtle, media_type="text/turtle")
     
 @app.get("/v1/gimie/{full_path:path}")
 async def gimie(full_path:str, 
                 format:str = "json-ld"):
     try:
-        gimie_output = extract_gimie(full_path, format=format)
+        gimie_output = await admission.run(extract_gimie, full_path, format=format)
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=424, #?
@@ -68,11 +117,27 @@ async def gimie(full_path:str,
     return {"link": full_path, 
             "output": gimie_output}
 
+# Declared before /v1/llm/{full_path:path}, which would match it too
+@app.get("/v1/llm/stream/{full_path:path}")
+async def llm_stream(full_path:str):
+    events = admission.stream(stream_llm_extraction, str(full_path))
+
+    async def event_stream():
+        try:
+            async for event, data in events:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @app.get("/v1/llm/{full_path:path}")
 async def llm(full_path:str):
 
     try:
-        llm_result = llm_request_repo_infos(str(full_path))
+        llm_result = await admission.run(llm_request_repo_infos, str(full_path))
+    except OverloadedError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=424, 
@@ -82,6 +147,69 @@ async def llm(full_path:str):
     return {"link": full_path, 
             "output": llm_result}
 
+class JobRequest(BaseModel):
+    url: str
+    format: str = "json-ld"
+
+def run_job(job):
+    return extract_result(job.url, on_stage=job.set_stage).render(job.format)
+
+job_manager = JobManager(run_job)
+
+@app.post("/v1/jobs", status_code=202)
+def create_job(request: JobRequest):
+    if request.format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format: {request.format}")
+
+    try:
+        job = job_manager.submit(request.url, request.format)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Job queue is full: {e}",
+            headers={"Retry-After": "30"}
+        )
+
+    return {"job_id": job.id, 
+            "status": job.status}
+
+def get_job_or_404(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+@app.get("/v1/jobs/{job_id}")
+def get_job(job_id: str):
+    return get_job_or_404(job_id).as_dict()
+
+@app.get("/v1/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    job = get_job_or_404(job_id)
+
+    async def event_stream():
+        sent = 0
+        while True:
+            # Read `done` before the events so the final status event is never missed
+            finished = job.done
+            for event in job.events_since(sent):
+                sent += 1
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+            if finished:
+                yield f"event: result\ndata: {json.dumps(job.as_dict())}\n\n"
+                break
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.exception_handler(OverloadedError)
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"message": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.exception_handler(ValueError)
 async def value_error_exception_handler(request: Request, exc: ValueError):
     return JSONResponse(
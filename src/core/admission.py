@@ -0,0 +1,183 @@
+import asyncio
+import os
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+MAX_IN_FLIGHT = int(os.environ.get("MAX_IN_FLIGHT", 4))
+MAX_QUEUED = int(os.environ.get("MAX_QUEUED", 16))
+RETRY_AFTER = int(os.environ.get("RETRY_AFTER", 30))
+
+
+class OverloadedError(Exception):
+    """Raised when a request is rejected because too much work is already admitted."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class AdmittedStream:
+    """
+    Async iterator over an admitted stream. It holds its admission slot until it
+    is exhausted, closed or garbage collected, even if it was never iterated,
+    e.g. when the client disconnects before the response starts.
+    """
+
+    def __init__(self, generator, release):
+        self._generator = generator
+        self._release = release
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._release()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._generator.__anext__()
+        except BaseException:
+            self.release()
+            raise
+
+    async def aclose(self):
+        try:
+            await self._generator.aclose()
+        finally:
+            self.release()
+
+    def __del__(self):
+        self.release()
+
+
+class _Reservation:
+    """
+    Slots held by a streaming request. Work submitted through it borrows a slot
+    until it ends; once the request is closed, each slot goes back to the
+    controller as soon as nothing uses it any more.
+    """
+
+    def __init__(self, controller: "AdmissionController", slots: int):
+        self._controller = controller
+        self._idle = slots
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _give_back(self):
+        with self._lock:
+            if not self._closed:
+                self._idle += 1
+                return
+        self._controller._release()
+
+    def submit(self, func, *args, **kwargs) -> Future:
+        """Run `func` on the pool, on one of the reserved slots."""
+        with self._lock:
+            self._idle -= 1
+
+        def run():
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Before the future resolves, so that the caller can submit again right away
+                self._give_back()
+
+        future = self._controller._executor.submit(run)
+        # Work cancelled before it started never runs `run`
+        future.add_done_callback(lambda f: f.cancelled() and self._give_back())
+        return future
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, 0
+        self._controller._release(idle)
+
+
+class AdmissionController:
+    """
+    Runs blocking work off the event loop on a bounded thread pool.
+
+    At most `max_in_flight` calls execute at once and `max_queued` more may wait
+    for a thread. Anything beyond that is rejected right away with
+    OverloadedError, so that requests do not pile up behind long extractions.
+    A slot is released when its work has finished on the pool, not when the
+    request goes away: work that already started keeps its slot until it ends.
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT,
+                 max_queued: int = MAX_QUEUED,
+                 retry_after: int = RETRY_AFTER):
+        self.capacity = max_in_flight + max_queued
+        self.retry_after = retry_after
+        self.admitted = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="extract")
+
+    def _acquire(self, slots: int = 1):
+        with self._lock:
+            if self.admitted + slots > self.capacity:
+                logger.warning(f"Rejecting request: {self.admitted} already admitted")
+                raise OverloadedError(self.retry_after)
+            self.admitted += slots
+
+    def _release(self, slots: int = 1):
+        with self._lock:
+            self.admitted -= slots
+
+    async def run(self, func, *args, **kwargs):
+        self._acquire()
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # Released from the pool, so that a cancelled request does not free the slot of running work
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def stream(self, func, *args, slots: int = 1, in_pool: bool = True, **kwargs):
+        """
+        Admit a streaming request: `func` returns a blocking iterator, and the
+        returned AdmittedStream pulls its items on the thread pool. The
+        request is rejected now rather than once the response has started,
+        and stays admitted until the stream is exhausted, closed or dropped.
+
+        A request running several units of work at once reserves `slots`.
+        An iterator that only waits on work it submits itself is pulled off
+        the pool (`in_pool=False`), so that it does not hold a pool thread,
+        and is given a `submit` callable running that work on the reserved
+        slots. When such a stream is closed early, the slots of work still
+        running are only freed one by one as that work ends.
+        """
+        self._acquire(slots)
+        reservation = _Reservation(self, slots)
+        executor = self._executor if in_pool else None
+        if not in_pool:
+            kwargs["submit"] = reservation.submit
+
+        async def generate():
+            loop = asyncio.get_running_loop()
+            iterator = None
+            done = object()
+            try:
+                iterator = await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+                while True:
+                    item = await loop.run_in_executor(executor, next, iterator, done)
+                    if item is done:
+                        break
+                    yield item
+            finally:
+                if iterator is not None and hasattr(iterator, "close"):
+                    await loop.run_in_executor(executor, iterator.close)
+
+        return AdmittedStream(generate(), reservation.close)
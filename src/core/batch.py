@@ -0,0 +1,105 @@
+import os
+import threading
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", 4))
+BATCH_PER_HOST = int(os.environ.get("BATCH_PER_HOST", 2))
+BATCH_MAX_URLS = int(os.environ.get("BATCH_MAX_URLS", 100))
+
+
+class HostLimiter:
+    """Number of running extractions per host, shared by every batch of the process."""
+
+    def __init__(self):
+        self._running: Dict[str, int] = {}
+        self._changed = threading.Condition()
+
+    def try_acquire(self, host: str, limit: int) -> bool:
+        with self._changed:
+            if self._running.get(host, 0) >= limit:
+                return False
+            self._running[host] = self._running.get(host, 0) + 1
+            return True
+
+    def release(self, host: str):
+        with self._changed:
+            self._running[host] -= 1
+            if not self._running[host]:
+                del self._running[host]
+            self._changed.notify_all()
+
+    def wait(self, timeout: float):
+        """Wait until some host frees up, or `timeout` seconds."""
+        with self._changed:
+            self._changed.wait(timeout)
+
+
+host_limiter = HostLimiter()
+
+
+def run_batch(urls: List[str], extract: Callable[[str], dict],
+              max_workers: int = BATCH_WORKERS,
+              per_host: int = BATCH_PER_HOST,
+              submit: Optional[Callable[..., Future]] = None,
+              limiter: HostLimiter = host_limiter) -> Iterator[dict]:
+    """
+    Run `extract` on every URL of a batch and yield each outcome as soon as
+    it is ready, in completion order, with the index of the URL in the batch.
+
+    At most `max_workers` extractions of the batch run at once, on the pool
+    behind `submit` (a private pool when not given), and at most `per_host`
+    per host across all batches. A URL is only submitted once its host has
+    room, so that workers never sit waiting on a busy host while other hosts
+    are pending. Closing the iterator cancels the extractions that have not
+    started yet.
+    """
+    pending: Dict[str, deque] = {}
+    for index, url in enumerate(urls):
+        pending.setdefault(urlparse(url).netloc.lower(), deque()).append(index)
+
+    running = {}
+    executor = None
+    if submit is None:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch")
+        submit = executor.submit
+
+    def schedule():
+        for host, queue in pending.items():
+            while queue and len(running) < max_workers and limiter.try_acquire(host, per_host):
+                index = queue.popleft()
+                future = submit(extract, urls[index])
+                future.add_done_callback(lambda _, host=host: limiter.release(host))
+                running[future] = index
+
+    try:
+        schedule()
+        while running or any(pending.values()):
+            if not running:
+                # Every pending host is busy with other batches
+                limiter.wait(timeout=1.0)
+                schedule()
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index = running.pop(future)
+
+                outcome = {"index": index, "link": urls[index]}
+                try:
+                    outcome["output"] = future.result()
+                except Exception as e:
+                    logger.error(f"Batch extraction of {urls[index]} failed: {e}")
+                    outcome["error"] = str(e)
+                schedule()
+                yield outcome
+    finally:
+        for future in running:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
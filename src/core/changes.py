@@ -0,0 +1,70 @@
+import os
+import re
+import subprocess
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Files whose content feeds the LLM-extracted metadata
+METADATA_FILES = {
+    "citation.cff", "codemeta.json", ".zenodo.json", "authors", "authors.md", "contributors.md",
+    "setup.py", "setup.cfg", "pyproject.toml", "package.json", "environment.yml", "environment.yaml",
+    "dockerfile", "description", "cargo.toml", "meta.yaml", "mkdocs.yml",
+}
+METADATA_PREFIXES = ("readme", "license", "licence", "copying", "requirements", "changelog", "citation")
+METADATA_EXTENSIONS = {".md", ".rst", ".ipynb", ".cff"}
+DOCS_DIRS = re.compile(r"(^|/)(docs?|documentation|notebooks?|examples?|tutorials?)/", re.IGNORECASE)
+
+
+def is_metadata_relevant(path: str) -> bool:
+    """
+    Whether a changed path may change the metadata the LLM extracts: README,
+    documentation, citation, licensing, packaging and notebook files.
+
+    >>> is_metadata_relevant("docs/usage.rst"), is_metadata_relevant("src/model.py")
+    (True, False)
+    """
+    name = os.path.basename(path).lower()
+    return (
+        name in METADATA_FILES
+        or name.startswith(METADATA_PREFIXES)
+        or os.path.splitext(name)[1] in METADATA_EXTENSIONS
+        or DOCS_DIRS.search(path) is not None
+    )
+
+
+def _git(repo_dir: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", "-C", repo_dir, *args], check=True, capture_output=True, text=True)
+
+
+def changed_paths(repo_dir: str, old_sha: str, new_sha: str = "HEAD") -> Optional[List[str]]:
+    """
+    Paths changed between two commits of a checkout. The old commit is fetched
+    (without its history) if the checkout is shallow. Returns None when the
+    commits cannot be compared, e.g. after a force-push removed the old one.
+    """
+    try:
+        try:
+            _git(repo_dir, "cat-file", "-e", f"{old_sha}^{{commit}}")
+        except subprocess.CalledProcessError:
+            _git(repo_dir, "fetch", "--quiet", "--depth", "1", "origin", old_sha)
+        diff = _git(repo_dir, "diff", "--name-only", "--no-renames", old_sha, new_sha)
+    except subprocess.CalledProcessError as e:
+        logger.warning(f"Could not diff {repo_dir} against {old_sha[:12]}: {e.stderr.strip() if e.stderr else e}")
+        return None
+    return [line for line in diff.stdout.splitlines() if line]
+
+
+def relevant_changes(repo_dir: str, old_sha: str) -> Optional[List[str]]:
+    """
+    The changed paths since `old_sha` that may affect the LLM-extracted
+    metadata, or None if the changes are unknown.
+    """
+    paths = changed_paths(repo_dir, old_sha)
+    if paths is None:
+        return None
+
+    relevant = [path for path in paths if is_metadata_relevant(path)]
+    logger.info(f"{len(paths)} paths changed since {old_sha[:12]}, {len(relevant)} relevant to the metadata")
+    return relevant
@@ -1,18 +1,24 @@
 import os
 import tempfile
 import subprocess
-import glob
 import requests
-import tiktoken
 import logging
 from dotenv import load_dotenv
 from pprint import pprint
 import openai
 
-from .prompts import system_prompt_json
+from .prompts import system_prompt_json, build_system_prompt, remaining_fields
 from .models import SoftwareSourceCode
 from ..utils.utils import *
 from .verification import Verification
+from .repo_cache import mirror_cache
+from .packer import pack_directory
+from .pruning import Pruner
+from .local_metadata import extract_local_metadata
+from .tokens import TokenBudget
+from .registry import get_registry, pruned_response_schema, pruned_response_model
+from ..utils.http import http_client
+from .llm_cache import llm_cache, llm_cache_key
 
 load_dotenv()
 
@@ -20,171 +26,224 @@ OPENROUTER_API_KEY = os.environ["OPENROUTER_API_KEY"]
 OPENROUTER_ENDPOINT = "https://openrouter.ai/api/v1/chat/completions"
 MODEL = os.environ["MODEL"]
 PROVIDER = os.environ["PROVIDER"]
+TEMPERATURE = 0.1
+OPENAI_SYSTEM_PROMPT = "You are a helpful assistant. Respond in JSON format."
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
-def reduce_input_size(input_text, max_tokens=800000):
+def clone_repo(repo_url, target_dir, shallow=True):
     """
-    Reduce the size of the input text to fit within the specified token limit.
+    Clone a GitHub repository into the given directory.
+    Shallow clones only fetch the last commit of the default branch.
+    When the mirror cache is enabled, the checkout is made from a local mirror.
     """
-    limiter_encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = limiter_encoding.encode(input_text)
-    
-    logger.info(f"Original amount of tokens: {len(tokens)}")
-    if len(tokens) > max_tokens:
-        tokens = tokens[:max_tokens]
-        reduced_text = limiter_encoding.decode(tokens)
-        logger.warning(f"Token count exceeded limit, truncated to {max_tokens} tokens")
-        return reduced_text
-    return input_text
-
-def sort_files_by_priority(file_paths):
-    """
-    Sorts a list of file paths based on a predefined extension priority.
-
-    The order is:
-    1. Documentation files (.md, .txt, .html)
-    2. Code files (.py, .r)
-    3. All other files
-    """
-    priority_order = {
-        # Priority 0: Documentation
-        ".md": 0,
-        ".txt": 0,
-        ".html": 0,
-        # Priority 1: Code
-        ".py": 1,
-        ".r": 1,
-    }
-    # Priority 2 will be the default for all other extensions
+    if mirror_cache is not None:
+        return mirror_cache.checkout(repo_url, target_dir, shallow=shallow)
 
-    def get_sort_key(filepath):
-        # Get the file extension
-        _, ext = os.path.splitext(filepath)
-        # Return a tuple: (priority, original_filepath)
-        # The priority is looked up from the map (defaulting to 2)
-        # The original filepath is used as a tie-breaker to maintain a stable sort
-        return (priority_order.get(ext.lower(), 2), filepath)
+    logger.info(f"Cloning {repo_url} into {target_dir}...")
+    command = ["git", "clone"]
+    if shallow:
+        command += ["--depth", "1", "--single-branch"]
+    subprocess.run(command + [repo_url, target_dir], check=True)
+    logger.info("Repository cloned successfully.")
+    return target_dir
 
-    return sorted(file_paths, key=get_sort_key)
 
-def combine_text_files(directory):
+def pack_repository(repo_dir, max_tokens=80000):
     """
-    Combine all text files in the specified directory into a single string.
+    Pack the content of a cloned repository into a single prompt text,
+    leaving out vendored, generated and duplicated content.
     """
-    combined_text = ""
-    txt_files = glob.glob(os.path.join(directory, "*.txt"))
-    
-    logger.info(f"Found {len(txt_files)} text files in {directory}")
+    return pack_directory(repo_dir, budget=TokenBudget(max_tokens), pruner=Pruner())
 
-    for file in txt_files:
-        logger.debug(f"Reading file: {file}")
-        with open(file, "r", encoding="utf-8") as f:
-            combined_text += f.read() + "\n"
-    
-    return combined_text
 
-def store_combined_text(input_text, output_file):
+def _system_prompt(exclude=frozenset()):
+    return build_system_prompt(exclude) if exclude else system_prompt_json
+
+
+def _completion_cache_key(input_text, exclude=frozenset()):
+    if PROVIDER == "openrouter":
+        system_prompt = _system_prompt(exclude)
+    elif PROVIDER == "openai":
+        system_prompt = OPENAI_SYSTEM_PROMPT
+    else:
+        raise ValueError("No provider provided")
+
+    return llm_cache_key(PROVIDER, MODEL, TEMPERATURE, system_prompt, pruned_response_schema(exclude), input_text)
+
+
+def parse_completion(content):
+    """Parse the JSON object answered by the LLM. Raises ValueError if it is not one."""
+    json_data = json.loads(clean_json_string(content))
+    if not isinstance(json_data, dict):
+        raise ValueError(f"Expected a JSON object from the LLM, got {type(json_data).__name__}")
+    return json_data
+
+
+def _cached_completion(key):
+    """The cached completion under `key`, dropping it if it does not parse."""
+    cached = llm_cache.get(key)
+    if cached is None:
+        return None
+    try:
+        parse_completion(cached["content"])
+    except ValueError:
+        logger.warning(f"Dropping unparsable cached LLM completion ({key[:12]})")
+        llm_cache.delete(key)
+        return None
+    return cached
+
+
+def get_completion(input_text, exclude=frozenset()):
+    """
+    Get the raw completion and token usage for the packed repository from the
+    configured provider. Identical requests are answered from the LLM cache.
+    Fields in `exclude` are already known and not asked from the LLM.
+    A completion is only cached once it parsed; otherwise ValueError is raised.
+    """
+    key = _completion_cache_key(input_text, exclude)
+    cached = _cached_completion(key)
+    if cached is not None:
+        return cached
+
+    if PROVIDER == "openrouter":
+        body = get_openrouter_response(input_text, model=MODEL, temperature=TEMPERATURE, exclude=exclude).json()
+        content = body["choices"][0]["message"]["content"]
+        usage = body.get("usage")
+    else:
+        response = get_openai_response(input_text, model=MODEL, temperature=TEMPERATURE, exclude=exclude)
+        content = response.choices[0].message.content
+        usage = response.usage.model_dump() if response.usage else None
+
+    parse_completion(content)
+    llm_cache.set(key, content, usage)
+    return {"content": content, "usage": usage}
+
+
+def stream_completion(input_text, exclude=frozenset()):
+    """
+    Yield the completion for the packed repository chunk by chunk, as the
+    provider generates it. A cached completion is yielded in one chunk, and a
+    completion streamed to its end is stored in the LLM cache if it parses.
+    """
+    if not remaining_fields(exclude):
+        logger.info("All fields are already known, skipping the LLM request")
+        yield "{}"
+        return
+
+    key = _completion_cache_key(input_text, exclude)
+    cached = _cached_completion(key)
+    if cached is not None:
+        yield cached["content"]
+        return
+
+    if PROVIDER == "openrouter":
+        stream = stream_openrouter_response(input_text, model=MODEL, temperature=TEMPERATURE, exclude=exclude)
+    else:
+        stream = stream_openai_response(input_text, model=MODEL, temperature=TEMPERATURE, exclude=exclude)
+
+    content = []
+    usage = None
+    try:
+        for chunk in stream:
+            if chunk["usage"]:
+                usage = chunk["usage"]
+            if chunk["content"]:
+                content.append(chunk["content"])
+                yield chunk["content"]
+    finally:
+        # Closing the provider stream drops the connection when the consumer stops early
+        stream.close()
+
+    content = "".join(content)
+    try:
+        parse_completion(content)
+    except ValueError as e:
+        logger.warning(f"Not caching the streamed LLM completion, it does not parse: {e}")
+        return
+    llm_cache.set(key, content, usage)
+
+
+def request_llm(input_text, exclude=frozenset()):
     """
-    Store the combined text into a specified output file.
+    Send the packed repository to the configured provider and parse the JSON answer.
+    Fields in `exclude` are not asked for; when no field is left, the LLM is not called.
     """
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(input_text)
-    logger.info(f"Combined text saved to {output_file}")
-    return output_file
-        
+    if not remaining_fields(exclude):
+        logger.info("All fields are already known, skipping the LLM request")
+        return {}
+
+    raw_result = get_completion(input_text, exclude)["content"]
+    json_data = parse_completion(raw_result)
+    pprint(json_data)
 
-def clone_repo(repo_url):
+    logger.info("Successfully parsed API response")
+    return json_data
+
+
+def verify_metadata(json_data):
     """
-    Clone a GitHub repository into a temporary directory.
+    Validate the LLM output and return a sanitized copy of it.
     """
-    with tempfile.TemporaryDirectory() as temp_dir:
-        logger.info(f"Cloning {repo_url} into {temp_dir}...")
-        try:
-            subprocess.run(["git", "clone", repo_url, temp_dir], check=True)
-            logger.info("Repository cloned successfully.")
-            return temp_dir
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to clone repository: {e}")
-            return None
-    
+    verifier = Verification(json_data)
+    verifier.run()
+    verifier.summary()
+
+    return verifier.sanitize_metadata()
+
+
+def metadata_to_jsonld(cleaned_json):
+    """
+    Convert the sanitized metadata to JSON-LD.
+    """
+    return json_to_jsonLD(cleaned_json, get_registry().jsonld_context)
+
 
 def llm_request_repo_infos(repo_url):    
     # Clone the GitHub repository into a temporary folder
     with tempfile.TemporaryDirectory() as temp_dir:
-        logger.info(f"Cloning {repo_url} into {temp_dir}...")
         try:
-            subprocess.run(["git", "clone", repo_url, temp_dir], check=True)
+            clone_repo(repo_url, temp_dir)
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to clone repository: {e}")
             return None
 
-        # Run the repo-to-text command in the repository directory
         try:
-            subprocess.run(["repo-to-text"], cwd=temp_dir, check=True)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"'repo-to-text' command failed: {e}")
+            local_data = extract_local_metadata(temp_dir)
+            input_text = pack_repository(temp_dir)
+        except OSError as e:
+            logger.error(f"Packing the repository failed: {e}")
             return None
 
-        input_text = combine_text_files(temp_dir)
-        input_text = reduce_input_size(input_text, max_tokens=80000)
-
-        combined_file_path = os.path.join(temp_dir, "combined_repo.txt")
-        store_combined_text(input_text, combined_file_path)
-
-
-        if PROVIDER == "openrouter":
-            response = get_openrouter_response(input_text, model=MODEL)
-        elif PROVIDER == "openai":
-            response = get_openai_response(input_text, model=MODEL)
-        else:
-            logger.error("No provider provided")
-
-        if response.status_code == 200:
-            try:
-                raw_result = response.json()["choices"][0]["message"]["content"]
-                parsed_result = clean_json_string(raw_result)
-                json_data = json.loads(parsed_result)
-                pprint(json_data)
-
-                logger.info("Successfully parsed API response")
-
-                # Run verification before converting to JSON-LD
-                verifier = Verification(json_data)
-                verifier.run()
-                verifier.summary()
+        try:
+            # Fields read from the metadata files take precedence over the LLM
+            json_data = {**request_llm(input_text, exclude=frozenset(local_data)), **local_data}
 
-                # Sanitize metadata before conversion
-                cleaned_json = verifier.sanitize_metadata()
+            # Run verification before converting to JSON-LD
+            cleaned_json = verify_metadata(json_data)
 
-                # TODO. This is hardcoded. Not good.
-                context_path = "src/files/json-ld-context.json"
-                # Now convert cleaned data to JSON-LD
-                return json_to_jsonLD(cleaned_json, context_path)
+            # Now convert cleaned data to JSON-LD
+            return metadata_to_jsonld(cleaned_json)
 
-            except Exception as e:
-                logger.error(f"Error parsing response: {e}")
-                return None
-        else:
-            logger.error(f"API Error: {response.status_code} - {response.text}")
+        except Exception as e:
+            logger.error(f"Error parsing response: {e}")
             return None
 
 
-def get_openrouter_response(input_text, model="google/gemini-2.5-flash", temperature=0.1):
+def _openrouter_request(input_text, model, temperature, exclude=frozenset()):
     """
-    Get structured response from openrouter
+    Build the headers and payload of an OpenRouter chat completion request.
     """
-    # Prepare payload for OpenRouter API
     payload = {
         "model": model,
         "messages": [
-            {"role": "system", "content": system_prompt_json},
+            {"role": "system", "content": _system_prompt(exclude)},
             {"role": "user", "content": input_text}
         ],
         "response_format": {
             "type": "json_schema",
-            "json_schema": SoftwareSourceCode.model_json_schema()
+            "json_schema": pruned_response_schema(exclude)
         },
         "temperature": temperature
     }
@@ -193,25 +252,61 @@ def get_openrouter_response(input_text, model="google/gemini-2.5-flash", tempera
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json"
     }
+    return headers, payload
 
 
-    # Send request to OpenRouter
+def get_openrouter_response(input_text, model="google/gemini-2.5-flash", temperature=0.1, exclude=frozenset()):
+    """
+    Get structured response from openrouter
+    """
+    headers, payload = _openrouter_request(input_text, model, temperature, exclude)
 
-    n = 3
-    while n != 0:
-        try:
-            response = requests.post(OPENROUTER_ENDPOINT, headers=headers, json=payload)
-            logger.info(f"API response status: {response.status_code}")
-            n = 0
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request failed: {e}")
-            n -= 1
-            return None
-        
+    # Send request to OpenRouter, retrying on rate limits and transient errors
+    try:
+        response = http_client.post(OPENROUTER_ENDPOINT, headers=headers, json=payload)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request failed: {e}")
+        raise
+
+    logger.info(f"API response status: {response.status_code}")
     return response
+
+
+def stream_openrouter_response(input_text, model="google/gemini-2.5-flash", temperature=0.1, exclude=frozenset()):
+    """
+    Stream a structured response from openrouter. Yields the content delta and
+    token usage (only present on the last chunk) of each server-sent event.
+    """
+    headers, payload = _openrouter_request(input_text, model, temperature, exclude)
+    payload["stream"] = True
+
+    try:
+        response = http_client.post(OPENROUTER_ENDPOINT, headers=headers, json=payload, stream=True)
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request failed: {e}")
+        raise
+
+    logger.info(f"API response status: {response.status_code}")
+    with response:
+        for line in response.iter_lines(decode_unicode=True):
+            # Blank lines separate events, lines starting with ':' are keep-alive comments
+            if not line or not line.startswith("data: "):
+                continue
+            data = line[len("data: "):]
+            if data == "[DONE]":
+                break
+
+            event = json.loads(data)
+            if "error" in event:
+                raise RuntimeError(f"OpenRouter stream error: {event['error']}")
+            choices = event.get("choices") or [{}]
+            yield {
+                "content": choices[0].get("delta", {}).get("content") or "",
+                "usage": event.get("usage"),
+            }
     
 
-def get_openai_response(prompt, model="gpt-4o", temperature=0.1):
+def get_openai_response(prompt, model="gpt-4o", temperature=0.1, exclude=frozenset()):
     """
     Get structured response from OpenAI API using SoftwareSourceCode schema.
     """
@@ -219,14 +314,47 @@ def get_openai_response(prompt, model="gpt-4o", temperature=0.1):
         response = openai.beta.chat.completions.parse(
             model=model,
             messages=[
-                {"role": "system", "content": "You are a helpful assistant. Respond in JSON format."},
+                {"role": "system", "content": OPENAI_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=temperature,
-            response_format=convert_httpurl_to_str(SoftwareSourceCode)
+            response_format=convert_httpurl_to_str(pruned_response_model(exclude))
         )
 
         return response
     except Exception as e:
         logger.error(f"OpenAI API error: {e}")
-        return None
\ No newline at end of file
+        raise
+
+
+def stream_openai_response(prompt, model="gpt-4o", temperature=0.1, exclude=frozenset()):
+    """
+    Stream a structured response from OpenAI API using SoftwareSourceCode schema.
+    Yields the content delta and token usage (only present on the last chunk).
+    """
+    try:
+        stream = openai.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": OPENAI_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "SoftwareSourceCode", "schema": pruned_response_schema(exclude)}
+            },
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+    except Exception as e:
+        logger.error(f"OpenAI API error: {e}")
+        raise
+
+    with stream:
+        for chunk in stream:
+            content = chunk.choices[0].delta.content if chunk.choices else None
+            yield {
+                "content": content or "",
+                "usage": chunk.usage.model_dump() if chunk.usage else None,
+            }
@@ -1,13 +1,54 @@
 from gimie.project import Project
-import json
+from gimie.extractors import infer_git_provider
+from gimie.io import LocalResource
+from pathlib import Path
+import io
+from typing import FrozenSet
 
-def extract_gimie(full_path: str, format: str = "json-ld"):
+from .registry import get_registry
+from ..utils.utils import graph_to_jsonld
+
+
+class CheckoutResource(LocalResource):
+    """A file of a local checkout, exposed under its path relative to the repository root."""
+
+    def __init__(self, root: str, relative_path: str):
+        super().__init__(relative_path)
+        self.full_path = Path(root) / relative_path
+
+    def open(self) -> io.RawIOBase:
+        return io.FileIO(self.full_path, mode="r")
+
+
+def needs_history(full_path: str) -> bool:
+    """GIMIE reads the commit history only for plain git remotes (no GitHub/GitLab API)."""
+    return infer_git_provider(full_path) == "git"
+
+
+def gimie_covered_fields(gimie_graph: list) -> FrozenSet[str]:
+    """
+    SoftwareSourceCode fields already present on the GIMIE node. Merging gives
+    priority to GIMIE, so asking the LLM for them would be wasted.
+    """
+    software_node = next(
+        (node for node in gimie_graph or [] if "http://schema.org/SoftwareSourceCode" in node.get("@type", [])),
+        None
+    )
+    if software_node is None:
+        return frozenset()
+
+    return frozenset(name for name, iri in get_registry().field_iris.items() if iri in software_node)
+
+
+def extract_gimie(full_path: str, format: str = "json-ld", local_path: str = None):
     """
     Extracts the GIMIE project from the given path.
     
     Args:
         full_path (str): The full path to the GIMIE project.
         format (str): The format to serialize the graph. Default is 'json-ld', or 'ttl'.
+        local_path (str): Optional checkout of the repository. When given, GIMIE
+            reads the repository files from it instead of cloning or downloading them.
         
     Returns:
         Project: The GIMIE project object.
@@ -15,12 +56,21 @@ def extract_gimie(full_path: str, format: str = "json-ld"):
 
     proj = Project(full_path)
 
+    if local_path is not None:
+        if needs_history(full_path):
+            # The git extractor clones on its own unless a local path is set
+            proj.extractor.local_path = local_path
+        else:
+            # GitHub/GitLab extractors download the root files; read them from the checkout instead
+            files = [CheckoutResource(local_path, path.name) for path in Path(local_path).iterdir() if path.is_file()]
+            proj.extractor.list_files = lambda: files
+
     # To retrieve the rdflib.Graph object
     g = proj.extract()
 
     if format == "json-ld":
-        # To retrieve the graph in JSON-LD format
-        output = json.loads(g.serialize(format="json-ld"))
+        # Expanded JSON-LD built straight from the triples, without a serialize/parse round trip
+        output = graph_to_jsonld(g)
     else:
         output = g.serialize(format=format)
 
@@ -28,4 +78,3 @@ def extract_gimie(full_path: str, format: str = "json-ld"):
         return None
     else:
         return output
-    
\ No newline at end of file
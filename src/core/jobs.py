@@ -0,0 +1,123 @@
+import os
+import time
+import uuid
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_MAX_PENDING = int(os.environ.get("JOB_MAX_PENDING", 100))
+JOB_RETENTION = float(os.environ.get("JOB_RETENTION", 3600))
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is already full."""
+
+
+class Job:
+    """State of one extraction job, updated by the worker and read by the API."""
+
+    def __init__(self, url: str, output_format: str = "json-ld"):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.format = output_format
+        self.status = "queued"
+        self.stages: Dict[str, str] = {}
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+        self.events.append({"event": "status", "data": {"status": self.status}})
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def set_status(self, status: str):
+        # The status changes together with its event, so that a reader seeing
+        # `done` also sees the final status event
+        with self._lock:
+            self.events.append({"event": "status", "data": {"status": status}})
+            if status in ("done", "failed"):
+                self.finished_at = time.time()
+            self.status = status
+
+    def set_stage(self, stage: str, status: str):
+        with self._lock:
+            self.stages[stage] = status
+            self.events.append({"event": "stage", "data": {"stage": stage, "status": status}})
+
+    def events_since(self, index: int) -> List[dict]:
+        with self._lock:
+            return self.events[index:]
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "link": self.url,
+            "status": self.status,
+            "stages": dict(self.stages),
+            "error": self.error,
+            "output": self.result,
+        }
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded in-process worker pool.
+
+    At most `max_workers` jobs run at once, and at most `max_pending` jobs may
+    wait or run; further submissions are rejected with QueueFullError.
+    """
+
+    def __init__(self, runner: Callable[[Job], object],
+                 max_workers: int = JOB_WORKERS,
+                 max_pending: int = JOB_MAX_PENDING,
+                 retention: float = JOB_RETENTION):
+        self.runner = runner
+        self.max_pending = max_pending
+        self.retention = retention
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, url: str, output_format: str = "json-ld") -> Job:
+        with self._lock:
+            self._prune()
+            pending = sum(1 for job in self.jobs.values() if not job.done)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} jobs already pending")
+
+            job = Job(url, output_format)
+            self.jobs[job.id] = job
+
+        self._executor.submit(self._run, job)
+        logger.info(f"Queued job {job.id} for {url}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _run(self, job: Job):
+        job.set_status("running")
+        try:
+            job.result = self.runner(job)
+            job.set_status("done")
+            logger.info(f"Job {job.id} finished")
+        except Exception as e:
+            job.error = str(e)
+            job.set_status("failed")
+            logger.error(f"Job {job.id} failed: {e}")
+
+    def _prune(self):
+        """Forget finished jobs older than the retention period."""
+        limit = time.time() - self.retention
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.done and job.finished_at < limit]
+        for job_id in expired:
+            del self.jobs[job_id]
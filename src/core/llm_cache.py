@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import logging
+from functools import cached_property
+from typing import Optional
+
+from ..utils.cache import CACHE_DIR, DiskCache
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm.sqlite"))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+LLM_CACHE_MAX_AGE = float(os.environ.get("LLM_CACHE_MAX_AGE", 30 * 24 * 3600))
+
+
+def llm_cache_key(provider: str, model: str, temperature: float,
+                  system_prompt: str, response_schema: dict, input_text: str) -> str:
+    """Content hash of everything that determines a completion."""
+    digest = hashlib.sha256()
+    header = json.dumps([provider, model, temperature, system_prompt, response_schema], sort_keys=True)
+    digest.update(header.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(input_text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Size-bounded cache of raw LLM completions and their token usage, keyed by
+    llm_cache_key(). Forks and mirrors that pack to the same prompt share an entry.
+    Only completions that parsed are stored, so a failed answer is asked again.
+    The SQLite file is only opened on first use.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 max_age: float = LLM_CACHE_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @cached_property
+    def store(self) -> DiskCache:
+        return DiskCache(self.path, max_bytes=self.max_bytes, max_age=self.max_age)
+
+    def get(self, key: str) -> Optional[dict]:
+        completion = self.store.get(key)
+        if completion is not None:
+            logger.info(f"LLM response cache hit ({key[:12]}), usage saved: {completion.get('usage')}")
+        return completion
+
+    def set(self, key: str, content: str, usage: Optional[dict]):
+        self.store.set(key, {"content": content, "usage": usage})
+
+    def delete(self, key: str):
+        self.store.delete(key)
+
+
+llm_cache = LLMResponseCache()
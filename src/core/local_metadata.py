@@ -0,0 +1,296 @@
+import json
+import os
+import re
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+logger = logging.getLogger(__name__)
+
+SPDX_URL = "https://spdx.org/licenses/"
+
+# SPDX identifiers accepted as is, matched case-insensitively
+KNOWN_LICENSES = {
+    license.lower(): license for license in (
+        "MIT", "Apache-2.0", "BSD-2-Clause", "BSD-3-Clause", "ISC", "MPL-2.0", "EPL-2.0",
+        "GPL-2.0-only", "GPL-2.0-or-later", "GPL-3.0-only", "GPL-3.0-or-later",
+        "LGPL-2.1-only", "LGPL-2.1-or-later", "LGPL-3.0-only", "LGPL-3.0-or-later",
+        "AGPL-3.0-only", "AGPL-3.0-or-later", "EUPL-1.2", "BSL-1.0", "Zlib", "Unlicense",
+        "CC0-1.0", "CC-BY-4.0", "CC-BY-SA-4.0", "Artistic-2.0",
+    )
+}
+# Deprecated SPDX identifiers still common in metadata files
+LICENSE_ALIASES = {
+    "gpl-2.0": "GPL-2.0-only", "gpl-2.0+": "GPL-2.0-or-later",
+    "gpl-3.0": "GPL-3.0-only", "gpl-3.0+": "GPL-3.0-or-later",
+    "lgpl-2.1": "LGPL-2.1-only", "lgpl-3.0": "LGPL-3.0-only", "agpl-3.0": "AGPL-3.0-only",
+}
+
+ORCID_PATTERN = re.compile(r"(\d{4}-\d{4}-\d{4}-\d{3}[\dX])$")
+AUTHOR_STRING_PATTERN = re.compile(r"^\s*([^<(]+?)\s*(?:<[^>]*>)?\s*(?:\([^)]*\))?\s*$")
+
+
+def normalize_license(value: Any) -> Optional[str]:
+    """
+    Map a license identifier or SPDX URL to its SPDX URL, or None when it is not a known identifier.
+
+    >>> normalize_license("apache-2.0")
+    'https://spdx.org/licenses/Apache-2.0'
+    >>> normalize_license("http://spdx.org/licenses/MIT.html")
+    'https://spdx.org/licenses/MIT'
+    """
+    if isinstance(value, list):
+        value = value[0] if len(value) == 1 else None
+    if isinstance(value, dict):
+        value = value.get("@id") or value.get("url") or value.get("text")
+    if not isinstance(value, str):
+        return None
+
+    identifier = re.sub(r"^https?://spdx\.org/licenses/", "", value.strip())
+    identifier = re.sub(r"\.(html|json)$", "", identifier).lower()
+    spdx_id = KNOWN_LICENSES.get(identifier) or LICENSE_ALIASES.get(identifier)
+    return SPDX_URL + spdx_id if spdx_id else None
+
+
+def normalize_orcid(value: Any) -> Optional[str]:
+    if not isinstance(value, str):
+        return None
+    match = ORCID_PATTERN.search(value.strip().rstrip("/"))
+    return f"https://orcid.org/{match.group(1)}" if match else None
+
+
+def normalize_date(value: Any) -> Optional[str]:
+    if isinstance(value, date):
+        return value.isoformat()[:10]
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip()[:10]).isoformat()
+        except ValueError:
+            return None
+    return None
+
+
+def normalize_url(value: Any) -> Optional[str]:
+    """
+    Return an http(s) URL, stripping the decorations of git remote URLs.
+
+    >>> normalize_url("git+https://github.com/foo/bar.git")
+    'https://github.com/foo/bar'
+    """
+    if isinstance(value, dict):
+        value = value.get("url") or value.get("@id")
+    if not isinstance(value, str):
+        return None
+    url = value.strip()
+    if url.startswith("git+"):
+        url = url[len("git+"):]
+    if url.endswith(".git"):
+        url = url[:-len(".git")]
+    return url if re.match(r"^https?://\S+$", url) else None
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _as_list(value: Any) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _person(name: Optional[str], orcid: Any = None, affiliations: Any = None) -> Optional[dict]:
+    if not name:
+        return None
+    person = {"name": name}
+    orcid_id = normalize_orcid(orcid)
+    if orcid_id:
+        person["orcidId"] = orcid_id
+    names = [_text(a.get("name") or a.get("legalName")) if isinstance(a, dict) else _text(a)
+             for a in _as_list(affiliations)]
+    names = [a for a in names if a]
+    if names:
+        person["affiliation"] = names
+    return person
+
+
+def _author_from_string(value: Any) -> Optional[dict]:
+    """Parse the `Name <email> (url)` form used by package.json and Poetry."""
+    if isinstance(value, dict):
+        return _person(_text(value.get("name")))
+    if not isinstance(value, str):
+        return None
+    match = AUTHOR_STRING_PATTERN.match(value)
+    return _person(match.group(1)) if match else None
+
+
+def _requirements(dependencies: Any) -> List[str]:
+    if isinstance(dependencies, dict):
+        requirements = []
+        for name, spec in dependencies.items():
+            if name == "python":
+                continue
+            if isinstance(spec, dict):
+                spec = spec.get("version")
+            requirements.append(f"{name} {spec}" if isinstance(spec, str) and spec not in ("", "*") else name)
+        return requirements
+    return [d.strip() for d in _as_list(dependencies) if isinstance(d, str) and d.strip()]
+
+
+def _compact(metadata: dict) -> dict:
+    return {key: value for key, value in metadata.items() if value not in (None, "", [], {})}
+
+
+def parse_citation_cff(text: str) -> dict:
+    cff = yaml.safe_load(text) or {}
+
+    authors = []
+    for author in _as_list(cff.get("authors")):
+        if not isinstance(author, dict):
+            continue
+        name = _text(author.get("name")) or _text(" ".join(
+            part for part in (author.get("given-names"), author.get("name-particle"), author.get("family-names"))
+            if isinstance(part, str) and part
+        ))
+        authors.append(_person(name, author.get("orcid"), author.get("affiliation")))
+
+    doi = _text(cff.get("doi"))
+    if not doi:
+        doi = next((_text(i.get("value")) for i in _as_list(cff.get("identifiers"))
+                    if isinstance(i, dict) and i.get("type") == "doi"), None)
+
+    preferred = cff.get("preferred-citation") or {}
+    citation_doi = _text(preferred.get("doi")) if isinstance(preferred, dict) else None
+
+    return _compact({
+        "name": _text(cff.get("title")),
+        "description": _text(cff.get("abstract")),
+        "author": [a for a in authors if a],
+        "license": normalize_license(cff.get("license")),
+        "datePublished": normalize_date(cff.get("date-released")),
+        "codeRepository": [u for u in [normalize_url(cff.get("repository-code"))] if u],
+        "url": normalize_url(cff.get("url")),
+        "identifier": doi,
+        "citation": [f"https://doi.org/{citation_doi}"] if citation_doi else [],
+    })
+
+
+def parse_codemeta(text: str) -> dict:
+    codemeta = json.loads(text)
+
+    authors = []
+    for author in _as_list(codemeta.get("author")):
+        if not isinstance(author, dict):
+            continue
+        name = _text(author.get("name")) or _text(" ".join(
+            part for part in (author.get("givenName"), author.get("familyName")) if isinstance(part, str) and part
+        ))
+        authors.append(_person(name, author.get("@id") or author.get("identifier"), author.get("affiliation")))
+
+    requirements = [r.get("name") if isinstance(r, dict) else r for r in _as_list(codemeta.get("softwareRequirements"))]
+    languages = [l.get("name") if isinstance(l, dict) else l for l in _as_list(codemeta.get("programmingLanguage"))]
+
+    return _compact({
+        "name": _text(codemeta.get("name")),
+        "description": _text(codemeta.get("description")),
+        "author": [a for a in authors if a],
+        "license": normalize_license(codemeta.get("license")),
+        "dateCreated": normalize_date(codemeta.get("dateCreated")),
+        "datePublished": normalize_date(codemeta.get("datePublished")),
+        "codeRepository": [u for u in map(normalize_url, _as_list(codemeta.get("codeRepository"))) if u],
+        "url": normalize_url(codemeta.get("url")),
+        "identifier": _text(codemeta.get("identifier")) if isinstance(codemeta.get("identifier"), str) else None,
+        "softwareRequirements": _requirements(requirements),
+        "programmingLanguage": [l for l in map(_text, languages) if l],
+    })
+
+
+def parse_pyproject(text: str) -> dict:
+    pyproject = tomllib.loads(text)
+    project = pyproject.get("project") or {}
+    poetry = (pyproject.get("tool") or {}).get("poetry") or {}
+    if not project and not poetry:
+        return {}
+
+    if project:
+        authors = [_person(_text(a.get("name"))) for a in _as_list(project.get("authors")) if isinstance(a, dict)]
+        urls = {key.lower(): value for key, value in (project.get("urls") or {}).items()}
+        license_value = project.get("license")
+        requirements = _requirements(project.get("dependencies"))
+    else:
+        authors = [_author_from_string(a) for a in _as_list(poetry.get("authors"))]
+        urls = {"repository": poetry.get("repository"), "homepage": poetry.get("homepage"),
+                "documentation": poetry.get("documentation")}
+        license_value = poetry.get("license")
+        requirements = _requirements(poetry.get("dependencies"))
+
+    repository = urls.get("repository") or urls.get("source") or urls.get("source code")
+    # The distribution name is not the software's name, which is left to the LLM
+    return _compact({
+        "description": _text((project or poetry).get("description")),
+        "author": [a for a in authors if a],
+        "license": normalize_license(license_value),
+        "codeRepository": [u for u in [normalize_url(repository)] if u],
+        "url": normalize_url(urls.get("homepage")),
+        "hasDocumentation": normalize_url(urls.get("documentation")),
+        "softwareRequirements": requirements,
+    })
+
+
+def parse_package_json(text: str) -> dict:
+    package = json.loads(text)
+    if not isinstance(package, dict):
+        return {}
+
+    authors = [_author_from_string(a) for a in _as_list(package.get("author"))]
+    # As for pyproject.toml, the package name is not taken as the software's name
+    return _compact({
+        "description": _text(package.get("description")),
+        "author": [a for a in authors if a],
+        "license": normalize_license(package.get("license")),
+        "codeRepository": [u for u in [normalize_url(package.get("repository"))] if u],
+        "url": normalize_url(package.get("homepage")),
+        "softwareRequirements": _requirements(package.get("dependencies")),
+    })
+
+
+# Most curated sources first: the first source providing a field wins
+LOCAL_SOURCES: List[tuple] = [
+    ("codemeta.json", parse_codemeta),
+    ("CITATION.cff", parse_citation_cff),
+    ("pyproject.toml", parse_pyproject),
+    ("package.json", parse_package_json),
+]
+
+
+def extract_local_metadata(repo_dir: str) -> Dict[str, Any]:
+    """
+    Read the structured metadata files at the root of a checkout and map them
+    onto SoftwareSourceCode fields (in the shape the LLM is asked to produce).
+    Only values that parse and validate are returned, so that these fields
+    need not be asked from the LLM.
+    """
+    metadata: Dict[str, Any] = {}
+    for filename, parse in LOCAL_SOURCES:
+        path = os.path.join(repo_dir, filename)
+        if not os.path.isfile(path):
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                fields = parse(f.read())
+        except Exception as e:
+            logger.warning(f"Could not parse {filename}: {e}")
+            continue
+
+        for key, value in fields.items():
+            metadata.setdefault(key, value)
+        logger.info(f"Read {sorted(fields)} from {filename}")
+
+    return metadata
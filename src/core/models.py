@@ -102,7 +102,9 @@ class SoftwareSourceCode(BaseModel):
 #
 ############################################################
 
-from typing import Any, Dict, List as ListType
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, List as ListType
 
 # A dictionary to map JSON-LD property URIs to functions that can convert them.
 # This provides a clean, declarative way to define the conversion process.
@@ -168,6 +170,23 @@ JSONLD_TO_PYDANTIC_MAPPING = {
     "http://w3id.org/nfdi4ing/metadata4ing#hasRorId": "hasRorId",
 }
 
+@lru_cache(maxsize=None)
+def get_field_shapes(model: type) -> Mapping[str, bool]:
+    """
+    Tells for each field of a model whether it holds a list
+    (including Optional[List[...]]). Computed once per model.
+    """
+    shapes = {}
+    for name, field in model.model_fields.items():
+        field_annotation = field.annotation
+        origin = get_origin(field_annotation)
+
+        is_list = origin is list or origin is ListType
+        if origin is Union: # Handles Optional[List[...]]
+            is_list = any(get_origin(arg) in (list, ListType) for arg in get_args(field_annotation))
+        shapes[name] = is_list
+    return MappingProxyType(shapes)
+
 def _get_value(obj: Any) -> Any:
     """Extracts a primitive value from a JSON-LD value object."""
     if isinstance(obj, dict):
@@ -181,89 +200,94 @@ def _get_list(entity: Dict, key: str) -> ListType[Any]:
     value = entity.get(key, [])
     return value if isinstance(value, list) else [value]
 
+# Model built for each node type. A node with several of these types is built
+# as the one listed first.
+JSONLD_TYPE_MODELS = {
+    "http://schema.org/Person": Person,
+    "http://schema.org/Organization": Organization,
+    "https://w3id.org/okn/o/sd#FundingInformation": FundingInformation,
+    "https://w3id.org/okn/o/sd#FormalParameter": FormalParameter,
+    "https://imaging-plaza.epfl.ch/ontology#ExecutableNotebook": ExecutableNotebook,
+    "https://w3id.org/okn/o/sd#SoftwareImage": SoftwareImage,
+    "http://schema.org/DataFeed": DataFeed,
+    "http://schema.org/SoftwareSourceCode": SoftwareSourceCode,
+}
+_TYPE_DISPATCH = {iri: (rank, model) for rank, (iri, model) in enumerate(JSONLD_TYPE_MODELS.items())}
+
+def _holds_model(annotation: Any, model: type = BaseModel) -> bool:
+    """Tells whether a field annotation refers to a subclass of `model`."""
+    if isinstance(annotation, type):
+        return issubclass(annotation, model)
+    return any(_holds_model(arg, model) for arg in get_args(annotation))
+
+def _as_list(values: Any) -> ListType[Any]:
+    return values if isinstance(values, list) else [values]
+
+def _convert_value(values: Any, all_entities: Dict) -> Any:
+    return _get_value(values)
+
+def _convert_values(values: Any, all_entities: Dict) -> ListType[Any]:
+    return [_get_value(v) for v in _as_list(values)]
+
+def _convert_node(values: Any, all_entities: Dict) -> Optional[BaseModel]:
+    ref = _get_value(values)
+    return _convert_entity(all_entities[ref], all_entities) if ref in all_entities else None
+
+def _convert_nodes(values: Any, all_entities: Dict) -> ListType[Optional[BaseModel]]:
+    refs = [_get_value(v) for v in _as_list(values)]
+    return [_convert_entity(all_entities[ref], all_entities) for ref in refs if ref in all_entities]
+
+def _convert_images(values: Any, all_entities: Dict) -> ListType[Image]:
+    urls = [_get_value(v) for v in _as_list(values)]
+    return [Image(contentUrl=url, keywords=ImageKeyword.ILLUSTRATIVE_IMAGE) for url in urls if url]
+
+@lru_cache(maxsize=None)
+def get_conversion_plan(model: type) -> Mapping[str, tuple]:
+    """
+    Maps each JSON-LD property of a model to its field and to the function
+    converting the property values for that field. Computed once per model.
+    """
+    shapes = get_field_shapes(model)
+    plan = {}
+    for iri, name in JSONLD_TO_PYDANTIC_MAPPING.items():
+        if name not in model.model_fields:
+            continue
+        annotation = model.model_fields[name].annotation
+        if _holds_model(annotation, Image):
+            convert = _convert_images
+        elif _holds_model(annotation):
+            convert = _convert_nodes if shapes[name] else _convert_node
+        else:
+            convert = _convert_values if shapes[name] else _convert_value
+        plan[iri] = (name, convert)
+    return MappingProxyType(plan)
+
+@lru_cache(maxsize=None)
+def _compile(model: type) -> tuple:
+    """The conversion plan of a model and the data each of its nodes starts from."""
+    plan = get_conversion_plan(model)
+    # Nested nodes set every field, so that one missing a required value is rejected
+    initial = {} if model is SoftwareSourceCode else dict.fromkeys(name for name, _ in plan.values())
+    return plan, initial
+
 def _convert_entity(entity: Dict, all_entities: Dict) -> Optional[BaseModel]:
     """Converts a single JSON-LD entity node to its corresponding Pydantic model."""
-    entity_types = _get_list(entity, "@type")
-
-    if "http://schema.org/Person" in entity_types:
-        return Person(
-            name=_get_value(entity.get("http://schema.org/name")),
-            orcidId=_get_value(entity.get("http://w3id.org/nfdi4ing/metadata4ing#orcidId")),
-            affiliation=[_get_value(v) for v in _get_list(entity, "http://schema.org/affiliation")] or None,
-        )
-    if "http://schema.org/Organization" in entity_types:
-        return Organization(
-            legalName=_get_value(entity.get("http://schema.org/legalName")),
-            hasRorId=_get_value(entity.get("http://w3id.org/nfdi4ing/metadata4ing#hasRorId")),
-        )
-    if "https://w3id.org/okn/o/sd#FundingInformation" in entity_types:
-        source_ref = _get_value(entity.get("https://w3id.org/okn/o/sd#fundingSource"))
-        return FundingInformation(
-            identifier=_get_value(entity.get("http://schema.org/identifier")),
-            fundingGrant=_get_value(entity.get("https://w3id.org/okn/o/sd#fundingGrant")),
-            fundingSource=_convert_entity(all_entities[source_ref], all_entities) if source_ref in all_entities else None,
-        )
-    if "https://w3id.org/okn/o/sd#FormalParameter" in entity_types:
-        return FormalParameter(
-            name=_get_value(entity.get("http://schema.org/name")),
-            description=_get_value(entity.get("http://schema.org/description")),
-            encodingFormat=_get_value(entity.get("http://schema.org/encodingFormat")),
-            hasDimensionality=_get_value(entity.get("https://w3id.org/okn/o/sd#hasDimensionality")),
-            hasFormat=_get_value(entity.get("https://w3id.org/okn/o/sd#hasFormat")),
-            defaultValue=_get_value(entity.get("http://schema.org/defaultValue")),
-            valueRequired=_get_value(entity.get("http://schema.org/valueRequired")),
-        )
-    if "https://imaging-plaza.epfl.ch/ontology#ExecutableNotebook" in entity_types:
-        return ExecutableNotebook(
-            name=_get_value(entity.get("http://schema.org/name")),
-            description=_get_value(entity.get("http://schema.org/description")),
-            url=_get_value(entity.get("http://schema.org/url")),
-        )
-    if "https://w3id.org/okn/o/sd#SoftwareImage" in entity_types:
-        return SoftwareImage(
-            name=_get_value(entity.get("http://schema.org/name")),
-            description=_get_value(entity.get("http://schema.org/description")),
-            softwareVersion=_get_value(entity.get("http://schema.org/softwareVersion")),
-            availableInRegistry=_get_value(entity.get("https://w3id.org/okn/o/sd#availableInRegistry")),
-        )
-    if "http://schema.org/DataFeed" in entity_types:
-        return DataFeed(
-            name=_get_value(entity.get("http://schema.org/name")),
-            description=_get_value(entity.get("http://schema.org/description")),
-            contentUrl=_get_value(entity.get("http://schema.org/contentUrl")),
-            measurementTechnique=_get_value(entity.get("http://schema.org/measurementTechnique")),
-            variableMeasured=_get_value(entity.get("http://schema.org/variableMeasured")),
-        )
-    if "http://schema.org/SoftwareSourceCode" in entity_types:
-        data = {}
-        for key, value in entity.items():
-            if key in JSONLD_TO_PYDANTIC_MAPPING:
-                pydantic_key = JSONLD_TO_PYDANTIC_MAPPING[key]
-                
-                # Handle nested objects and lists of objects by reference
-                if pydantic_key in ["author", "supportingData", "hasExecutableNotebook", "hasParameter", "hasFunding", "hasSoftwareImage"]:
-                    refs = [_get_value(v) for v in _get_list(entity, key)]
-                    data[pydantic_key] = [_convert_entity(all_entities[ref], all_entities) for ref in refs if ref in all_entities]
-                elif pydantic_key == "image":
-                    urls = [_get_value(v) for v in _get_list(entity, key)]
-                    data[pydantic_key] = [Image(contentUrl=url, keywords=ImageKeyword.ILLUSTRATIVE_IMAGE) for url in urls if url]
-                else:
-                    # Check if the target field is a list type (including Optional[List[...]])
-                    field_annotation = SoftwareSourceCode.model_fields[pydantic_key].annotation
-                    origin = get_origin(field_annotation)
-                    
-                    is_list = origin is list or origin is ListType
-                    if origin is Union: # Handles Optional[List[...]]
-                        is_list = any(get_origin(arg) in (list, ListType) for arg in get_args(field_annotation))
-
-                    if is_list:
-                        # Handle lists of strings/URLs
-                        data[pydantic_key] = [_get_value(v) for v in _get_list(entity, key)]
-                    else:
-                        # Handle single values
-                        data[pydantic_key] = _get_value(value)
-        return SoftwareSourceCode(**data)
-    return None
+    types = _get_list(entity, "@type")
+    if len(types) == 1:
+        ranked = _TYPE_DISPATCH.get(types[0])
+    else:
+        ranked = min((_TYPE_DISPATCH[t] for t in types if t in _TYPE_DISPATCH), default=None)
+    if ranked is None:
+        return None
+    model = ranked[1]
+    plan, initial = _compile(model)
+
+    data = initial.copy()
+    for key, values in entity.items():
+        entry = plan.get(key)
+        if entry is not None:
+            data[entry[0]] = entry[1](values, all_entities)
+    return model(**data)
 
 def convert_jsonld_to_pydantic(jsonld_graph: ListType[Dict[str, Any]]) -> Optional[SoftwareSourceCode]:
     """
@@ -0,0 +1,252 @@
+import io
+import os
+import re
+import logging
+from typing import List, Optional, Tuple
+
+from .tokens import TokenBudget
+from .pruning import Pruner
+
+logger = logging.getLogger(__name__)
+
+# Number of leading bytes inspected to decide whether a file is binary
+BINARY_SNIFF_BYTES = 8000
+
+
+def sort_files_by_priority(file_paths):
+    """
+    Sorts a list of file paths based on a predefined extension priority.
+
+    The order is:
+    1. Documentation files (.md, .txt, .html)
+    2. Code files (.py, .r)
+    3. All other files
+    """
+    priority_order = {
+        # Priority 0: Documentation
+        ".md": 0,
+        ".txt": 0,
+        ".html": 0,
+        # Priority 1: Code
+        ".py": 1,
+        ".r": 1,
+    }
+    # Priority 2 will be the default for all other extensions
+
+    def get_sort_key(filepath):
+        # Get the file extension
+        _, ext = os.path.splitext(filepath)
+        # Return a tuple: (priority, original_filepath)
+        # The priority is looked up from the map (defaulting to 2)
+        # The original filepath is used as a tie-breaker to maintain a stable sort
+        return (priority_order.get(ext.lower(), 2), filepath)
+
+    return sorted(file_paths, key=get_sort_key)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression matching a relative path."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                regex += re.escape(pattern[i])
+                i += 1
+            else:
+                regex += "[" + pattern[i + 1:end].replace("\\", "\\\\").replace("!", "^", 1) + "]"
+                i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+
+class GitignoreMatcher:
+    """
+    Matches paths against the .gitignore files of a tree.
+
+    Rules are collected per directory while walking, so nested .gitignore files
+    apply to their own subtree, and later rules (including `!` negations)
+    override earlier ones as in git.
+    """
+
+    def __init__(self):
+        # (directory relative to the root, compiled regex, negated, directory only)
+        self.rules: List[Tuple[str, re.Pattern, bool, bool]] = []
+
+    def add_file(self, gitignore_path: str, base: str):
+        try:
+            with open(gitignore_path, "r", encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            if line.startswith("\\"):
+                line = line[1:]
+
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            # A pattern containing a slash is relative to the .gitignore location,
+            # otherwise it matches the name at any depth below it
+            if "/" in line:
+                regex = _glob_to_regex(line.lstrip("/"))
+            else:
+                regex = "(?:.*/)?" + _glob_to_regex(line)
+
+            self.rules.append((base, re.compile(regex + "$"), negated, dir_only))
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for base, regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                candidate = rel_path[len(base) + 1:]
+            else:
+                candidate = rel_path
+            if regex.match(candidate):
+                ignored = not negated
+        return ignored
+
+
+def is_binary_file(path: str) -> bool:
+    """Sniff the beginning of a file: NUL bytes mean binary content."""
+    try:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return True
+
+
+def list_repository_files(repo_dir: str, pruner: Optional[Pruner] = None) -> List[str]:
+    """
+    List the text files of a checkout (relative paths), honoring .gitignore and skipping .git.
+    With a pruner, vendored directories are not walked.
+    """
+    matcher = GitignoreMatcher()
+    files = []
+
+    for root, dirs, filenames in os.walk(repo_dir):
+        rel_root = os.path.relpath(root, repo_dir).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root
+
+        if ".gitignore" in filenames:
+            matcher.add_file(os.path.join(root, ".gitignore"), rel_root)
+
+        def rel(name):
+            return f"{rel_root}/{name}" if rel_root else name
+
+        dirs[:] = sorted(
+            d for d in dirs
+            if d != ".git" and not matcher.is_ignored(rel(d), True)
+            and not (pruner is not None and pruner.skip_dir(rel(d)))
+        )
+
+        for name in filenames:
+            rel_path = rel(name)
+            full_path = os.path.join(root, name)
+            if os.path.islink(full_path) or matcher.is_ignored(rel_path, False):
+                continue
+            if is_binary_file(full_path):
+                logger.debug(f"Skipping binary file: {rel_path}")
+                continue
+            files.append(rel_path)
+
+    return files
+
+
+def pack_directory(repo_dir: str, budget: Optional[TokenBudget] = None,
+                   pruner: Optional[Pruner] = None) -> str:
+    """
+    Pack the text files of a checkout into a single prompt string:
+    the list of files first, then each file content, documentation first.
+    With a budget, files stop being read once it cannot hold more content;
+    the files left are still listed, pruned on their path only.
+    With a pruner, vendored, generated and duplicated content is left out,
+    of the file list as well.
+    """
+    files = sort_files_by_priority(list_repository_files(repo_dir, pruner))
+    logger.info(f"Packing {len(files)} text files from {repo_dir}")
+
+    # Files are pruned before anything is written, so that the list only names
+    # files whose content is packed (or was cut by the budget)
+    char_limit = budget.char_limit() if budget is not None else None
+    kept: List[Tuple[str, Optional[str]]] = []
+    for rel_path in files:
+        full_path = os.path.join(repo_dir, rel_path)
+        if pruner is not None and pruner.skip_file(rel_path, full_path):
+            continue
+
+        if char_limit is not None and char_limit <= 0:
+            # Later contents cannot be packed, so they are not read
+            kept.append((rel_path, None))
+            continue
+
+        with open(full_path, "r", encoding="utf-8", errors="replace") as f:
+            # Anything beyond the character limit cannot fit in the budget anyway.
+            # Notebooks are read whole, their outputs are stripped before counting.
+            if char_limit is None or (pruner is not None and rel_path.endswith(".ipynb")):
+                content = f.read()
+                complete = True
+            else:
+                content = f.read(char_limit + 1)
+                complete = len(content) <= char_limit
+
+        if pruner is not None:
+            content = pruner.prune(rel_path, full_path, content, complete)
+            if content is None:
+                continue
+
+        if char_limit is not None:
+            char_limit -= len(content)
+        kept.append((rel_path, content))
+
+    def write(text, closing=""):
+        buffer.write(budget.take(text, closing) if budget is not None else text)
+
+    buffer = io.StringIO()
+    write("Directory Structure:\n" + "".join(f"{rel_path}\n" for rel_path, _ in kept) + "\n")
+
+    for index, (rel_path, content) in enumerate(kept):
+        if content is None or (budget is not None and budget.exhausted):
+            logger.warning(f"Token budget reached, skipped {len(kept) - index} files")
+            break
+
+        write(f'<content full_path="{rel_path}">\n{content}\n</content>\n', closing="\n</content>\n")
+
+    if budget is not None:
+        logger.info(f"Packed about {budget.used} tokens")
+    if pruner is not None:
+        logger.info(f"{repo_dir}: {pruner.report.summary()}")
+
+    return buffer.getvalue()
@@ -0,0 +1,250 @@
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+from .gimie_methods import extract_gimie, gimie_covered_fields, needs_history
+from .genai_model import (
+    MODEL,
+    clone_repo,
+    pack_repository,
+    request_llm,
+    stream_completion,
+    verify_metadata,
+    metadata_to_jsonld,
+)
+from .local_metadata import extract_local_metadata
+from .changes import relevant_changes
+from .stages import StageGraph, StageError
+from .streaming import IncrementalJSONParser
+from .result_cache import ResultCache, checkout_head_sha, resolve_head_sha
+from .results import ExtractionResult, ResultMemory
+from ..utils.utils import merge_jsonld, normalize_repo_url
+
+logger = logging.getLogger(__name__)
+
+result_cache = ResultCache()
+result_memory = ResultMemory()
+
+# Extractions in progress, so that concurrent requests for the same commit share one run
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+class _Extraction:
+    """An extraction in progress and, once finished, its result or error."""
+
+    def __init__(self):
+        self.finished = threading.Event()
+        self.result: Optional[ExtractionResult] = None
+        self.error: Optional[BaseException] = None
+
+
+# Stages whose failure means the LLM side of the extraction could not be completed
+LLM_STAGES = ("clone", "local", "pack", "llm", "verify", "jsonld")
+
+
+class LLMServiceError(Exception):
+    """Raised when the LLM part of the pipeline could not produce a result."""
+
+
+def _notify(on_stage: Optional[Callable[[str, str], None]], stage: str, status: str):
+    if on_stage is not None:
+        on_stage(stage, status)
+
+
+def build_extraction_graph(full_path: str, work_dir: str, previous: Optional[dict] = None) -> StageGraph:
+    """
+    Pipeline stages of an extraction:
+    clone -> {GIMIE, metadata files, packing} -> LLM -> verification -> JSON-LD conversion -> merge.
+    GIMIE and the packer share a single checkout, which is shallow unless GIMIE
+    needs the commit history. The LLM is only asked for the fields that neither
+    GIMIE (which wins the merge) nor the metadata files (CITATION.cff,
+    codemeta.json, ...) provide; the latter take precedence over the LLM.
+
+    With the `previous` LLM result of the repository ({"commit", "llm",
+    "gimie_fields"}), the checkout is first diffed against its commit: when no
+    README, docs, citation, packaging or notebook file changed, and GIMIE still
+    provides the fields the LLM was not asked for then, the LLM branch is
+    skipped and the previous result is merged with the fresh GIMIE output
+    instead. The LLM branch then waits for GIMIE before packing.
+    """
+    graph = StageGraph()
+    graph.add("clone", lambda r: clone_repo(full_path, work_dir, shallow=not needs_history(full_path)))
+    graph.add("gimie", lambda r: extract_gimie(full_path, format="json-ld", local_path=r["clone"]), after=["clone"])
+    # Read before the merge, which adds the LLM fields to the GIMIE node in place
+    graph.add("gimie_fields", lambda r: gimie_covered_fields(r["gimie"]), after=["gimie"])
+
+    if previous is not None:
+        graph.add("changes", lambda r: relevant_changes(r["clone"], previous["commit"]), after=["clone"])
+
+        def llm_needed(r):
+            if r["changes"] is None or r["changes"]:
+                return True
+            # The previous result lacks the fields GIMIE provided back then
+            excluded = previous.get("gimie_fields")
+            return excluded is None or not set(excluded) <= r["gimie_fields"]
+
+        branch_start = ["clone", "changes", "gimie_fields"]
+    else:
+        llm_needed = None
+        branch_start = ["clone"]
+
+    graph.add("local", lambda r: extract_local_metadata(r["clone"]), after=branch_start, when=llm_needed)
+    graph.add("pack", lambda r: pack_repository(r["clone"]), after=branch_start, when=llm_needed)
+    graph.add("llm", lambda r: request_llm(r["pack"], exclude=frozenset(r["local"]) | r["gimie_fields"]),
+              after=["pack", "local", "gimie_fields"], when=llm_needed)
+    graph.add("verify", lambda r: verify_metadata({**r["llm"], **r["local"]}), after=["llm", "local"], when=llm_needed)
+    graph.add("jsonld", lambda r: metadata_to_jsonld(r["verify"]), after=["verify"], when=llm_needed)
+    graph.add("merge", lambda r: merge_jsonld(r["gimie"], r["jsonld"] if r["jsonld"] is not None else previous["llm"]),
+              after=["gimie", "gimie_fields", "jsonld"])
+    return graph
+
+
+def run_extraction(full_path: str, on_stage: Optional[Callable[[str, str], None]] = None) -> dict:
+    """
+    Run GIMIE and the LLM on a repository and return the merged JSON-LD.
+    See extract_result().
+    """
+    return extract_result(full_path, on_stage).graph
+
+
+def extract_result(full_path: str, on_stage: Optional[Callable[[str, str], None]] = None) -> ExtractionResult:
+    """
+    Run GIMIE and the LLM on a repository and return the canonical result,
+    from which every output format is rendered.
+
+    Results are cached per HEAD commit, so an unchanged repository is answered
+    without cloning it or calling the LLM, and a repository whose new commits
+    do not touch metadata-relevant files only gets GIMIE refreshed. The latest
+    results are also kept in memory with their rendered formats, and concurrent
+    requests for the same commit wait for a single extraction, and get its
+    error if it fails.
+    `on_stage(stage, status)` is called whenever a stage starts ("running") or
+    ends ("done", "failed", "skipped", "hit", "miss").
+    """
+    _notify(on_stage, "cache", "running")
+    commit_sha = resolve_head_sha(full_path)
+    if not commit_sha:
+        _notify(on_stage, "cache", "miss")
+        graph, checkout_sha = _run_pipeline(full_path, None, on_stage)
+        return ExtractionResult(full_path, graph, checkout_sha)
+
+    key = (normalize_repo_url(full_path), commit_sha, MODEL)
+    with _inflight_lock:
+        result = result_memory.get(key)
+        running = _inflight.get(key) if result is None else None
+        owner = result is None and running is None
+        if owner:
+            running = _inflight[key] = _Extraction()
+
+    if not owner:
+        if result is None:
+            running.finished.wait()
+            if running.error is not None:
+                # Running the failed extraction again would pay for the LLM once per waiter
+                raise running.error
+            result = running.result
+        _notify(on_stage, "cache", "hit")
+        return result
+
+    try:
+        cached = result_cache.get(full_path, commit_sha, MODEL)
+        if cached is not None:
+            _notify(on_stage, "cache", "hit")
+            result = ExtractionResult(full_path, cached, commit_sha)
+        else:
+            _notify(on_stage, "cache", "miss")
+            graph, checkout_sha = _run_pipeline(full_path, commit_sha, on_stage)
+            result = ExtractionResult(full_path, graph, checkout_sha or commit_sha)
+
+        # A commit pushed after the HEAD was resolved is only remembered under its own SHA
+        if result.commit_sha == commit_sha:
+            result_memory.set(key, result)
+        running.result = result
+        return result
+    except BaseException as e:
+        running.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        running.finished.set()
+
+
+def _run_pipeline(full_path: str, commit_sha: Optional[str],
+                  on_stage: Optional[Callable[[str, str], None]]) -> Tuple[dict, Optional[str]]:
+    """
+    Run the extraction stages and return the merged JSON-LD with the commit SHA
+    of the checkout it was extracted from. Results are cached under that SHA,
+    not under `commit_sha` (resolved before cloning), which a push in between
+    would make stale.
+    """
+    previous = result_cache.get_latest(full_path, MODEL) if commit_sha else None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        graph = build_extraction_graph(full_path, temp_dir, previous)
+        try:
+            results = graph.run(on_stage)
+        except StageError as e:
+            if e.stage in LLM_STAGES:
+                raise LLMServiceError(e.error) from e.error
+            raise e.error
+        checkout_sha = checkout_head_sha(results["clone"])
+
+    merged_results = results["merge"]
+
+    if checkout_sha:
+        result_cache.set(full_path, checkout_sha, MODEL, merged_results)
+        if results["jsonld"] is not None:
+            result_cache.set_latest(full_path, MODEL, checkout_sha, results["jsonld"], results["gimie_fields"])
+        else:
+            result_cache.set_latest(full_path, MODEL, checkout_sha, previous["llm"], previous["gimie_fields"])
+
+    return merged_results, checkout_sha
+
+
+def stream_llm_extraction(full_path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Run the LLM side of the extraction, streaming the completion.
+
+    Yields ("field", {"name", "value"}) for each top-level field of the
+    metadata: first those read from the metadata files, then the others as
+    soon as the LLM has finished writing them, then ("result",
+    json-ld) once verified and converted. Malformed output or a failed stage
+    yields ("error", message) and stops the stream, so that the completion is
+    not generated any further.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        try:
+            clone_repo(full_path, temp_dir)
+            local_data = extract_local_metadata(temp_dir)
+            input_text = pack_repository(temp_dir)
+        except Exception as e:
+            logger.error(f"Preparing {full_path} for the LLM failed: {e}")
+            yield "error", str(e)
+            return
+
+    for name, value in local_data.items():
+        yield "field", {"name": name, "value": value}
+
+    parser = IncrementalJSONParser()
+    completion = stream_completion(input_text, exclude=frozenset(local_data))
+    try:
+        for chunk in completion:
+            for name, value in parser.feed(chunk):
+                if name not in local_data:
+                    yield "field", {"name": name, "value": value}
+        json_data = {**parser.result(), **local_data}
+    except Exception as e:
+        logger.error(f"LLM stream for {full_path} aborted: {e}")
+        yield "error", str(e)
+        return
+    finally:
+        completion.close()
+
+    try:
+        yield "result", metadata_to_jsonld(verify_metadata(json_data))
+    except Exception as e:
+        logger.error(f"Verification of the streamed metadata failed: {e}")
+        yield "error", str(e)
@@ -1,4 +1,6 @@
-system_prompt_json = """
+from typing import Iterable, List
+
+SYSTEM_PROMPT_HEADER = """
 You are an expert in scientific software metadata extraction and categorization.
 
 The user will provide the full codebase of a software project. Your task is to extract and populate structured metadata that conforms strictly to the schema described below.
@@ -27,72 +29,79 @@ The user will provide the full codebase of a software project. Your task is to e
 - Be conservative. Leave the field empty if you have doubts.
 
 📂 **Schema Specification:**
-- `name` (string, **required**): Title of the software.
-- `description` (string of max 2000 characters, **required**): A concise description of the software.
-- `image` (list of **valid URLs**): A list of representative image URLs of the software.
-- `applicationCategory` (list of strings, **optional**): Scientific disciplines or categories that the software belongs to.
-- `author` (list of objects, **required**): Each author must be an object containing:
+"""
+
+# Specification of each field of SoftwareSourceCode, in prompt order
+FIELD_SPECS = [
+    ("name", """- `name` (string, **required**): Title of the software."""),
+    ("description", """- `description` (string of max 2000 characters, **required**): A concise description of the software."""),
+    ("image", """- `image` (list of **valid URLs**): A list of representative image URLs of the software."""),
+    ("applicationCategory", """- `applicationCategory` (list of strings, **optional**): Scientific disciplines or categories that the software belongs to."""),
+    ("author", """- `author` (list of objects, **required**): Each author must be an object containing:
   - `name` (string, **required**)
   - `orcidId` (valid URL, **optional**)
-  - `affiliation` (list of strings, **optional**): Institutions the author is affiliated with. Do not mention Imaging Plaza unless is explicity mentioned.
-- `relatedToOrganization` (list of strings, **optional**): Institutions associated with the software. Do not mention Imaging Plaza unless is explicity mentioned.
-- `softwareRequirements` (list of strings, **optional**): Dependencies or prerequisites for running the software.
-- `operatingSystem` (list of strings, **optional**): Compatible operating systems. Use only Windows, Linux, MacOS, or Other.
-- `programmingLanguage` (list of strings, **optional**): Programming languages used in the software.
-- `supportingData` (list of objects, **optional**): Each object must contain:
+  - `affiliation` (list of strings, **optional**): Institutions the author is affiliated with. Do not mention Imaging Plaza unless is explicity mentioned."""),
+    ("relatedToOrganization", """- `relatedToOrganization` (list of strings, **optional**): Institutions associated with the software. Do not mention Imaging Plaza unless is explicity mentioned."""),
+    ("softwareRequirements", """- `softwareRequirements` (list of strings, **optional**): Dependencies or prerequisites for running the software."""),
+    ("operatingSystem", """- `operatingSystem` (list of strings, **optional**): Compatible operating systems. Use only Windows, Linux, MacOS, or Other."""),
+    ("programmingLanguage", """- `programmingLanguage` (list of strings, **optional**): Programming languages used in the software."""),
+    ("supportingData", """- `supportingData` (list of objects, **optional**): Each object must contain:
   - `name` (string, **optional**)
   - `description` (string, **optional**)
   - `contentURL` (valid URL, **optional**)
   - `measurementTechnique` (string, **optional**)
-  - `variableMeasured` (string, **optional**)
-- `codeRepository` (list of **valid URLs**, **required**): URLs of code repositories (e.g., GitHub, GitLab).
-- `citation` (list of **valid URLs**, **required**): Academic references or citations.
-- `dateCreated` (string, **required, format YYYY-MM-DD**): The date the software was initially created.
-- `datePublished` (string, **required, format YYYY-MM-DD**): The date the software was made publicly available.
-- `license` (string matching pattern `spdx.org.*`, **required**).
-- `url` (valid URL, **required**): The main website or landing page of the software.
-- `identifier` (string, **required**): Unique identifier (DOI, UUID, etc.).
-- `isAccessibleForFree` (boolean, **optional**): True/False indicating if the software is freely available.
-- `isBasedOn` (valid URL, **optional**): A reference to related work/software.
-- `isPluginModuleOf` (list of strings, **optional**): Software frameworks the software integrates with.
-- `hasDocumentation` (valid URL, **optional**): URL of the official documentation.
-- `hasExecutableNotebook` (list of objects, **optional**): Each object must contain:
+  - `variableMeasured` (string, **optional**)"""),
+    ("codeRepository", """- `codeRepository` (list of **valid URLs**, **required**): URLs of code repositories (e.g., GitHub, GitLab)."""),
+    ("citation", """- `citation` (list of **valid URLs**, **required**): Academic references or citations."""),
+    ("dateCreated", """- `dateCreated` (string, **required, format YYYY-MM-DD**): The date the software was initially created."""),
+    ("datePublished", """- `datePublished` (string, **required, format YYYY-MM-DD**): The date the software was made publicly available."""),
+    ("license", """- `license` (string matching pattern `spdx.org.*`, **required**)."""),
+    ("url", """- `url` (valid URL, **required**): The main website or landing page of the software."""),
+    ("identifier", """- `identifier` (string, **required**): Unique identifier (DOI, UUID, etc.)."""),
+    ("isAccessibleForFree", """- `isAccessibleForFree` (boolean, **optional**): True/False indicating if the software is freely available."""),
+    ("isBasedOn", """- `isBasedOn` (valid URL, **optional**): A reference to related work/software."""),
+    ("isPluginModuleOf", """- `isPluginModuleOf` (list of strings, **optional**): Software frameworks the software integrates with."""),
+    ("hasDocumentation", """- `hasDocumentation` (valid URL, **optional**): URL of the official documentation."""),
+    ("hasExecutableNotebook", """- `hasExecutableNotebook` (list of objects, **optional**): Each object must contain:
   - `name` (string, **optional**)
   - `description` (string, **optional**)
-  - `url` (valid URL, **required**)
-- `hasParameter` (list of objects, **required**): Each object must contain:
+  - `url` (valid URL, **required**)"""),
+    ("hasParameter", """- `hasParameter` (list of objects, **required**): Each object must contain:
   - `name` (string of max 60 characters, **optional**)
   - `description` (string of max 2000 characters, **optional**)
   - `encodingFormat` (valid URL, **optional**)
   - `hasDimensionality` (integer > 0, **optional**)
   - `hasFormat` (string, **optional**)
   - `defaultValue` (string, **optional**)
-  - `valueRequired` (boolean, **optional**)
-- `hasFunding` (list of objects, **required**): Each object must contain:
+  - `valueRequired` (boolean, **optional**)"""),
+    ("hasFunding", """- `hasFunding` (list of objects, **required**): Each object must contain:
   - `identifier` (string, **optional**)
   - `fundingGrant` (string, **optional**)
   - `fundingSource` (object, **optional**):
     - `legalName` (string, **optional**)
-    - `hasRorId` (valid URL, **optional**)
-- `hasSoftwareImage` (list of objects, **required**): Each object must contain:
+    - `hasRorId` (valid URL, **optional**)"""),
+    ("hasSoftwareImage", """- `hasSoftwareImage` (list of objects, **required**): Each object must contain:
   - `name` (string, **optional**)
   - `description` (string, **optional**)
-  - `softwareVersion` (string matching pattern `[0-9]+\.[0-9]+\.[0-9]+`, **optional**).
-  - `availableInRegistry` (valid URL, **optional**).
-- `processorRequirements` (list of strings, **optional**): Minimum processor requirements.
-- `memoryRequirements` (integer, **optional**): Minimum memory required (in MB).
-- `requiresGPU` (boolean, **optional**): Whether the software requires a GPU.
-- `fairLevel` (string, **optional**): FAIR (Findable, Accessible, Interoperable, Reusable) level.
-- `graph` (string, **optional**): Graph data representation.
-- `conditionsOfAccess` (string, **optional**): Conditions of access to the software (free to access or not for example).
-- `featureList` (list of strings, **optional**): List of features representing the Software.
-- `isBasedOn` (valid URL, **optional**): The software, website or app the software is based on.
-- `isPluginModuleOf` (list of strings, **optional**): The software or app the software is plugin or module of.
-- `hasAcknowledgements` (string, **optional**): The acknowledgements to the software authors name.
-- `hasExecutableInstructions` (string, **optional**): Any exectuable instructions related to the software. This should point to an URL where the installation is explained. If this is the README file, please make the full URL. 
-- `readme` (valid URL, **optional**): README url of the software (at the root of the repo)
-- `imagingModality (list of strings, **optional**): imaging modalities accepted by the software.
+  - `softwareVersion` (string matching pattern `[0-9]+\\.[0-9]+\\.[0-9]+`, **optional**).
+  - `availableInRegistry` (valid URL, **optional**)."""),
+    ("processorRequirements", """- `processorRequirements` (list of strings, **optional**): Minimum processor requirements."""),
+    ("memoryRequirements", """- `memoryRequirements` (integer, **optional**): Minimum memory required (in MB)."""),
+    ("requiresGPU", """- `requiresGPU` (boolean, **optional**): Whether the software requires a GPU."""),
+    ("fairLevel", """- `fairLevel` (string, **optional**): FAIR (Findable, Accessible, Interoperable, Reusable) level."""),
+    ("graph", """- `graph` (string, **optional**): Graph data representation."""),
+    ("conditionsOfAccess", """- `conditionsOfAccess` (string, **optional**): Conditions of access to the software (free to access or not for example)."""),
+    ("featureList", """- `featureList` (list of strings, **optional**): List of features representing the Software."""),
+    ("isBasedOn", """- `isBasedOn` (valid URL, **optional**): The software, website or app the software is based on."""),
+    ("isPluginModuleOf", """- `isPluginModuleOf` (list of strings, **optional**): The software or app the software is plugin or module of."""),
+    ("hasAcknowledgements", """- `hasAcknowledgements` (string, **optional**): The acknowledgements to the software authors name."""),
+    ("hasExecutableInstructions", """- `hasExecutableInstructions` (string, **optional**): Any exectuable instructions related to the software. This should point to an URL where the installation is explained. If this is the README file, please make the full URL. """),
+    ("readme", """- `readme` (valid URL, **optional**): README url of the software (at the root of the repo)"""),
+    ("imagingModality", """- `imagingModality (list of strings, **optional**): imaging modalities accepted by the software.
+"""),
+]
 
+SYSTEM_PROMPT_FOOTER = """
 
 When dealing with Organization pay attention to
 - 
@@ -107,3 +116,23 @@ When parsing Persons note:
 
 PLEASE PROVIDE THE OUTPUT IN JSON FORMAT ONLY, WITHOUT ANY EXPLANATION OR ADDITIONAL TEXT. ALIGN THE RESPONSE TO THE SCHEMA SPECIFICATION.
 """
+
+
+def remaining_fields(exclude: Iterable[str] = ()) -> List[str]:
+    """Fields of the schema specification that are still asked from the LLM."""
+    exclude = set(exclude)
+    return list(dict.fromkeys(name for name, _ in FIELD_SPECS if name not in exclude))
+
+
+def build_system_prompt(exclude: Iterable[str] = ()) -> str:
+    """
+    Assemble the system prompt, leaving out the specification of the fields in
+    `exclude` (already known from another source). Without exclusions this is
+    `system_prompt_json`.
+    """
+    exclude = set(exclude)
+    specs = "\n".join(text for name, text in FIELD_SPECS if name not in exclude)
+    return SYSTEM_PROMPT_HEADER + specs + SYSTEM_PROMPT_FOOTER
+
+
+system_prompt_json = build_system_prompt()
@@ -0,0 +1,180 @@
+import json
+import hashlib
+import math
+import os
+import logging
+from typing import Dict, List, Optional
+
+from .changes import METADATA_FILES
+from .tokens import CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+# Directories holding third-party or build output, never walked
+VENDOR_DIRS = {
+    "node_modules", "bower_components", "jspm_packages", "vendor", "third_party", "third-party",
+    ".venv", "venv", "site-packages", "__pycache__", ".tox", ".nox", ".eggs",
+    ".mypy_cache", ".pytest_cache", ".ipynb_checkpoints", "dist", "build",
+}
+
+LOCK_FILES = {
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock",
+    "Pipfile.lock", "pdm.lock", "uv.lock", "Cargo.lock", "composer.lock", "Gemfile.lock",
+    "go.sum", "conda-lock.yml", "flake.lock",
+}
+
+GENERATED_SUFFIXES = (
+    ".min.js", ".min.css", ".map", ".svg", "_pb2.py", "_pb2_grpc.py", ".pb.go", ".lock",
+)
+
+# Markers found in the header of generated source files
+GENERATED_MARKERS = ("@generated", "do not edit", "code generated by", "autogenerated by", "auto-generated by")
+GENERATED_HEADER_CHARS = 1024
+
+# Prose may legitimately have very long lines, so documentation is never treated as minified
+PROSE_EXTENSIONS = {".md", ".rst", ".txt", ".tex", ".cff"}
+MINIFIED_MIN_CHARS = 1024
+MINIFIED_AVG_LINE = 300
+MINIFIED_MAX_LINE = 5000
+
+# Bytes read at a time when hashing a file for deduplication
+DIGEST_CHUNK_BYTES = 1 << 16
+
+
+def strip_notebook(text: str) -> str:
+    """
+    Render a Jupyter notebook as its cell sources in the percent format,
+    dropping outputs (including embedded images), execution counts and metadata.
+    """
+    notebook = json.loads(text)
+    cells = []
+    for cell in notebook.get("cells", []):
+        source = cell.get("source", "")
+        if isinstance(source, list):
+            source = "".join(source)
+        cells.append(f"# %% [{cell.get('cell_type', 'code')}]\n{source.rstrip()}\n")
+    return "\n".join(cells)
+
+
+def is_minified(text: str) -> bool:
+    if len(text) < MINIFIED_MIN_CHARS:
+        return False
+    lines = text.splitlines() or [text]
+    return len(text) / len(lines) > MINIFIED_AVG_LINE or max(map(len, lines)) > MINIFIED_MAX_LINE
+
+
+def is_generated(text: str) -> bool:
+    header = text[:GENERATED_HEADER_CHARS].lower()
+    return any(marker in header for marker in GENERATED_MARKERS)
+
+
+class PruneReport:
+    """Files left out of the prompt, grouped by reason, and what they would have cost."""
+
+    def __init__(self):
+        self.pruned: Dict[str, List[str]] = {}
+        self.bytes_saved = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return math.ceil(self.bytes_saved / CHARS_PER_TOKEN)
+
+    def add(self, reason: str, rel_path: str, bytes_saved: int):
+        self.pruned.setdefault(reason, []).append(rel_path)
+        self.bytes_saved += max(bytes_saved, 0)
+
+    def as_dict(self) -> dict:
+        return {
+            "pruned": {reason: len(paths) for reason, paths in self.pruned.items()},
+            "bytes_saved": self.bytes_saved,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{len(paths)} {reason}" for reason, paths in sorted(self.pruned.items()))
+        return f"Pruned {counts or 'nothing'}: {self.bytes_saved} bytes, about {self.tokens_saved} tokens saved"
+
+
+class Pruner:
+    """
+    Drops content that only crowds the prompt: vendored directories, lock
+    files, generated and minified files, duplicated files and notebook outputs.
+
+    Vendored directories are skipped without being walked, so their size is
+    not part of the report.
+    """
+
+    def __init__(self):
+        self.report = PruneReport()
+        self._seen: Dict[str, str] = {}
+
+    def skip_dir(self, rel_path: str) -> bool:
+        if os.path.basename(rel_path) in VENDOR_DIRS:
+            self.report.add("vendored", rel_path + "/", 0)
+            return True
+        return False
+
+    def skip_file(self, rel_path: str, full_path: str) -> bool:
+        """Decide from the path alone, before the file is read."""
+        name = os.path.basename(rel_path)
+        if name in LOCK_FILES:
+            reason = "lock file"
+        elif name.lower().endswith(GENERATED_SUFFIXES):
+            reason = "generated"
+        else:
+            return False
+        self.report.add(reason, rel_path, _file_size(full_path))
+        return True
+
+    def prune(self, rel_path: str, full_path: str, content: str, complete: bool = True) -> Optional[str]:
+        """
+        Return the content to pack, or None to leave the file out. `complete` is
+        False when `content` was cut to the budget.
+        """
+        ext = os.path.splitext(rel_path)[1].lower()
+
+        if ext == ".ipynb":
+            try:
+                stripped = strip_notebook(content)
+            except (ValueError, AttributeError) as e:
+                logger.debug(f"Could not parse notebook {rel_path}: {e}")
+            else:
+                self.report.add("notebook outputs", rel_path, _file_size(full_path) - len(stripped.encode("utf-8")))
+                content = stripped
+        elif ext not in PROSE_EXTENSIONS and os.path.basename(rel_path).lower() not in METADATA_FILES:
+            # Metadata files are what the prompt is for, even when written on a single line by a tool
+            if is_generated(content):
+                self.report.add("generated", rel_path, _file_size(full_path))
+                return None
+            if is_minified(content):
+                self.report.add("minified", rel_path, _file_size(full_path))
+                return None
+
+        if content.strip():
+            # A truncated content is not enough to compare files, the whole file is hashed then;
+            # notebooks are compared on their stripped cells
+            if complete or ext == ".ipynb":
+                digest = hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+            else:
+                digest = _file_digest(full_path)
+            if digest in self._seen:
+                self.report.add("duplicate", rel_path, _file_size(full_path))
+                return None
+            self._seen[digest] = rel_path
+
+        return content
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(DIGEST_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
@@ -0,0 +1,163 @@
+import copy
+import json
+import os
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, FrozenSet, Mapping, Optional
+
+from pydantic import BaseModel, create_model
+
+from .models import SoftwareSourceCode, get_field_shapes
+from .tokens import get_encoder
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "files", "json-ld-context.json")
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Static artifacts are read-only, copy.deepcopy() them to get a mutable copy")
+
+
+class FrozenDict(dict):
+    """
+    A dict that cannot be modified. Still a dict, so that JSON encoders and
+    PyLD accept it; copy.deepcopy() returns a plain, mutable dict.
+    """
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def __deepcopy__(self, memo):
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class FrozenList(list):
+    """A list that cannot be modified; see FrozenDict."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn the dicts and lists of a JSON document into FrozenDict and FrozenList."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class StaticArtifacts:
+    """
+    Constant artifacts shared by every request, built once then only read.
+    The JSON documents are frozen, so that a user mutating them fails instead
+    of changing them for every other request.
+    """
+
+    response_schema: dict
+    jsonld_context: dict
+    field_shapes: Mapping[str, bool]
+    field_iris: Mapping[str, str]
+    build_seconds: float
+
+
+_registry: Optional[StaticArtifacts] = None
+_lock = threading.Lock()
+
+
+def context_field_iris(jsonld_context: dict) -> Mapping[str, str]:
+    """
+    Expanded IRI of each SoftwareSourceCode field under the JSON-LD context,
+    i.e. the key the field gets once the LLM output is converted to JSON-LD.
+    """
+    terms = jsonld_context["@context"]
+    iris = {}
+    for name in SoftwareSourceCode.model_fields:
+        value = terms.get(name)
+        if isinstance(value, dict):
+            value = value.get("@id")
+        if not isinstance(value, str):
+            continue
+        prefix, _, local = value.partition(":")
+        iris[name] = terms[prefix] + local if isinstance(terms.get(prefix), str) else value
+    return MappingProxyType(iris)
+
+
+def build_registry() -> StaticArtifacts:
+    start = time.perf_counter()
+
+    with open(CONTEXT_PATH, encoding="utf-8") as context:
+        jsonld_context = json.load(context)
+
+    try:
+        # Kept by get_encoder(), so that the first request does not download it
+        get_encoder()
+    except Exception as e:
+        # It is loaded lazily again later
+        logger.warning(f"Could not load the token encoder during warm-up: {e}")
+
+    return StaticArtifacts(
+        response_schema=freeze(SoftwareSourceCode.model_json_schema()),
+        jsonld_context=freeze(jsonld_context),
+        field_shapes=get_field_shapes(SoftwareSourceCode),
+        field_iris=context_field_iris(jsonld_context),
+        build_seconds=time.perf_counter() - start,
+    )
+
+
+def get_registry() -> StaticArtifacts:
+    """Return the static artifacts, building them on first use if warm_up() was not called."""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = build_registry()
+    return _registry
+
+
+def warm_up() -> StaticArtifacts:
+    registry = get_registry()
+    logger.info(f"Static artifacts registry built in {registry.build_seconds * 1000:.1f} ms")
+    return registry
+
+
+@lru_cache(maxsize=None)
+def pruned_response_schema(exclude: FrozenSet[str] = frozenset()) -> dict:
+    """The response schema without the fields in `exclude`, built once per set of fields."""
+    schema = get_registry().response_schema
+    if not exclude:
+        return schema
+
+    schema = copy.deepcopy(schema)
+    schema["properties"] = {name: spec for name, spec in schema["properties"].items() if name not in exclude}
+    if "required" in schema:
+        schema["required"] = [name for name in schema["required"] if name not in exclude]
+    return freeze(schema)
+
+
+@lru_cache(maxsize=None)
+def pruned_response_model(exclude: FrozenSet[str] = frozenset()) -> type:
+    """SoftwareSourceCode without the fields in `exclude`, for providers taking a model class."""
+    if not exclude:
+        return SoftwareSourceCode
+
+    fields = {
+        name: (field.annotation, field)
+        for name, field in SoftwareSourceCode.model_fields.items()
+        if name not in exclude
+    }
+    return create_model("SoftwareSourceCode", __base__=BaseModel, **fields)
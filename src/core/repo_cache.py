@@ -0,0 +1,163 @@
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+from ..utils.cache import CACHE_DIR
+from ..utils.utils import normalize_repo_url
+
+logger = logging.getLogger(__name__)
+
+REPO_MIRROR_ENABLED = os.environ.get("REPO_MIRROR_ENABLED", "true").lower() in ("1", "true", "yes")
+REPO_MIRROR_DIR = os.environ.get("REPO_MIRROR_DIR", os.path.join(CACHE_DIR, "mirrors"))
+REPO_MIRROR_MAX_BYTES = int(os.environ.get("REPO_MIRROR_MAX_BYTES", 5 * 1024 ** 3))
+
+MIRROR_FETCH_REFSPEC = "+refs/heads/*:refs/heads/*"
+
+
+def _directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class MirrorCache:
+    """
+    On-disk cache of bare repository mirrors.
+
+    The first checkout of a repository creates a bare clone of its branches and
+    tags; later checkouts only fetch the new objects into it, then clone locally from the mirror.
+    A lock file per mirror lets several workers share the cache, and the least
+    recently used mirrors are removed once the cache exceeds `max_bytes`.
+    The size of each mirror is measured when it is fetched and kept next to it,
+    so that eviction does not walk every mirror. The root folder is only
+    created on the first checkout.
+    """
+
+    def __init__(self, root: str = REPO_MIRROR_DIR, max_bytes: int = REPO_MIRROR_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def mirror_path(self, repo_url: str) -> str:
+        digest = hashlib.sha256(normalize_repo_url(repo_url).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.root, f"{digest}.git")
+
+    @contextmanager
+    def _locked(self, path: str, blocking: bool = True):
+        """Hold an exclusive lock on `path`. Yields False if non-blocking and already held."""
+        with open(path + ".lock", "w") as lock_file:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _update(self, repo_url: str, mirror: str):
+        if os.path.isdir(mirror) and self._is_legacy_mirror(mirror):
+            # Created with `clone --mirror`, which also fetches refs/pull/* and the like
+            logger.info(f"Recreating mirror {mirror} without pull request refs...")
+            shutil.rmtree(mirror, ignore_errors=True)
+
+        if os.path.isdir(mirror):
+            logger.info(f"Fetching new objects of {repo_url} into mirror {mirror}...")
+            subprocess.run(["git", "--git-dir", mirror, "fetch", "--prune", "--tags", "--quiet", "origin"], check=True)
+        else:
+            logger.info(f"Creating mirror of {repo_url} in {mirror}...")
+            partial = mirror + ".partial"
+            shutil.rmtree(partial, ignore_errors=True)
+            # A bare clone only takes branches and tags; the refspec makes later fetches do the same
+            subprocess.run(["git", "clone", "--bare", "--quiet", repo_url, partial], check=True)
+            subprocess.run(["git", "--git-dir", partial, "config", "remote.origin.fetch",
+                            MIRROR_FETCH_REFSPEC], check=True)
+            os.rename(partial, mirror)
+
+        self._write_size(mirror, _directory_size(mirror))
+
+    def _is_legacy_mirror(self, mirror: str) -> bool:
+        result = subprocess.run(["git", "--git-dir", mirror, "config", "--get", "remote.origin.mirror"],
+                                capture_output=True, text=True)
+        return result.stdout.strip() == "true"
+
+    def _write_size(self, mirror: str, size: int):
+        with open(mirror + ".size", "w") as f:
+            f.write(str(size))
+
+    def _size(self, mirror: str) -> int:
+        """Size of a mirror as recorded on its last fetch, measured if unknown."""
+        try:
+            with open(mirror + ".size") as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            size = _directory_size(mirror)
+            self._write_size(mirror, size)
+            return size
+
+    def checkout(self, repo_url: str, target_dir: str, shallow: bool = True) -> str:
+        """Materialize the current HEAD of `repo_url` into `target_dir` from its mirror."""
+        mirror = self.mirror_path(repo_url)
+        os.makedirs(self.root, exist_ok=True)
+        with self._locked(mirror):
+            self._update(repo_url, mirror)
+
+            command = ["git", "clone", "--quiet"]
+            if shallow:
+                # --depth is only honoured for file:// URLs, not for plain local paths
+                command += ["--depth", "1", "--single-branch", f"file://{mirror}"]
+            else:
+                command += ["--local", mirror]
+            subprocess.run(command + [target_dir], check=True)
+            subprocess.run(["git", "-C", target_dir, "remote", "set-url", "origin", repo_url], check=True)
+
+            # Used as the last access time for eviction
+            os.utime(mirror)
+
+        self.evict()
+        return target_dir
+
+    def evict(self) -> int:
+        """Remove least recently used mirrors until the cache fits in `max_bytes`."""
+        if not os.path.isdir(self.root):
+            return 0
+
+        mirrors = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.endswith(".git") and os.path.isdir(path):
+                mirrors.append((os.stat(path).st_mtime, path, self._size(path)))
+
+        total = sum(size for _, _, size in mirrors)
+        removed = 0
+        for _, path, size in sorted(mirrors):
+            if total <= self.max_bytes:
+                break
+            with self._locked(path, blocking=False) as acquired:
+                # Skip mirrors that another worker is using right now
+                if not acquired:
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                try:
+                    os.remove(path + ".size")
+                except OSError:
+                    pass
+            total -= size
+            removed += 1
+            logger.info(f"Evicted repository mirror {path}")
+
+        return removed
+
+
+mirror_cache: Optional[MirrorCache] = MirrorCache() if REPO_MIRROR_ENABLED else None
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+import logging
+from functools import cached_property
+from typing import Iterable, Optional
+
+from .prompts import system_prompt_json
+from .registry import get_registry
+from ..utils.cache import CACHE_DIR, DiskCache
+from ..utils.utils import normalize_repo_url
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_PATH = os.environ.get("RESULT_CACHE_PATH", os.path.join(CACHE_DIR, "results.sqlite"))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+RESULT_CACHE_MAX_AGE = float(os.environ.get("RESULT_CACHE_MAX_AGE", 30 * 24 * 3600))
+# Requests for the same repository within this many seconds reuse the resolved HEAD
+HEAD_SHA_TTL = float(os.environ.get("HEAD_SHA_TTL", 60))
+
+_head_shas = {}
+_head_shas_lock = threading.Lock()
+
+
+def resolve_head_sha(repo_url: str, timeout: float = 30) -> Optional[str]:
+    """
+    Resolve the commit SHA of the remote HEAD without cloning, using `git ls-remote`.
+    The answer is reused for HEAD_SHA_TTL seconds. Returns None if the remote
+    cannot be reached.
+    """
+    key = normalize_repo_url(repo_url)
+    with _head_shas_lock:
+        cached = _head_shas.get(key)
+    if cached is not None and time.monotonic() - cached[1] <= HEAD_SHA_TTL:
+        return cached[0]
+
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", repo_url, "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
+        # OSError covers a missing git executable
+        logger.warning(f"Could not resolve HEAD of {repo_url}: {e}")
+        return None
+
+    line = result.stdout.strip().splitlines()
+    commit_sha = line[0].split()[0] if line else None
+    if commit_sha:
+        with _head_shas_lock:
+            _head_shas[key] = (commit_sha, time.monotonic())
+    return commit_sha
+
+
+def checkout_head_sha(repo_dir: str) -> Optional[str]:
+    """Commit SHA of a checkout, which may be newer than the HEAD resolved before cloning."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", repo_dir, "rev-parse", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.warning(f"Could not read the commit of {repo_dir}: {e}")
+        return None
+    return result.stdout.strip() or None
+
+
+def pipeline_fingerprint() -> str:
+    """
+    Hash of everything that shapes the LLM output besides the model: system prompt,
+    response schema and JSON-LD context. Any change invalidates the cached results.
+    """
+    registry = get_registry()
+    digest = hashlib.sha256()
+    digest.update(system_prompt_json.encode("utf-8"))
+    digest.update(json.dumps(registry.response_schema, sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(registry.jsonld_context, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Persistent cache of merged extraction results, keyed by
+    (normalized repo URL, HEAD commit SHA, model, prompt/schema fingerprint).
+    The LLM result of the last extracted commit of each repository is kept
+    as well, so that it can be reused when only unrelated files changed.
+    The SQLite file is only opened on first use.
+    """
+
+    def __init__(self, path: str = RESULT_CACHE_PATH,
+                 max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 max_age: float = RESULT_CACHE_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @cached_property
+    def store(self) -> DiskCache:
+        return DiskCache(self.path, max_bytes=self.max_bytes, max_age=self.max_age)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        return pipeline_fingerprint()
+
+    def key(self, repo_url: str, commit_sha: str, model: str) -> str:
+        return "|".join([normalize_repo_url(repo_url), commit_sha, model, self.fingerprint])
+
+    def get(self, repo_url: str, commit_sha: str, model: str) -> Optional[dict]:
+        result = self.store.get(self.key(repo_url, commit_sha, model))
+        if result is not None:
+            logger.info(f"Result cache hit for {repo_url} @ {commit_sha[:12]}")
+        return result
+
+    def set(self, repo_url: str, commit_sha: str, model: str, result: dict) -> None:
+        self.store.set(self.key(repo_url, commit_sha, model), result)
+        logger.info(f"Stored result for {repo_url} @ {commit_sha[:12]} in cache")
+
+    def latest_key(self, repo_url: str, model: str) -> str:
+        return "|".join(["latest", normalize_repo_url(repo_url), model, self.fingerprint])
+
+    def get_latest(self, repo_url: str, model: str) -> Optional[dict]:
+        """
+        The last LLM result of a repository, whatever its commit:
+        {"commit", "llm", "gimie_fields"}, the latter being the fields GIMIE
+        provided, which the LLM was not asked for.
+        """
+        return self.store.get(self.latest_key(repo_url, model))
+
+    def set_latest(self, repo_url: str, model: str, commit_sha: str, llm_result: dict,
+                   gimie_fields: Iterable[str]) -> None:
+        self.store.set(self.latest_key(repo_url, model),
+                       {"commit": commit_sha, "llm": llm_result, "gimie_fields": sorted(gimie_fields)})
@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from rdflib import Graph
+
+from .models import convert_jsonld_to_pydantic, convert_pydantic_to_zod_form_dict
+
+logger = logging.getLogger(__name__)
+
+RESULT_MEMORY_SIZE = int(os.environ.get("RESULT_MEMORY_SIZE", 64))
+
+OUTPUT_FORMATS = ("json-ld", "json", "turtle")
+
+
+class ExtractionResult:
+    """
+    Canonical merged graph of one extraction. The output formats are rendered
+    from it on first request and memoized, so that asking for another format
+    of the same extraction only costs a conversion.
+    """
+
+    def __init__(self, link: str, graph: dict, commit_sha: Optional[str] = None):
+        self.link = link
+        self.graph = graph
+        self.commit_sha = commit_sha
+        self._views: Dict[str, Any] = {"json-ld": graph}
+        self._lock = threading.Lock()
+
+    def render(self, format: str = "json-ld") -> Any:
+        if format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+
+        with self._lock:
+            if format not in self._views:
+                self._views[format] = getattr(self, f"_render_{format.replace('-', '_')}")()
+            return self._views[format]
+
+    def _render_json(self) -> dict:
+        pydantic_data = convert_jsonld_to_pydantic(self.graph["@graph"])
+        return convert_pydantic_to_zod_form_dict(pydantic_data)
+
+    def _render_turtle(self) -> str:
+        # The nodes are already expanded, so the remote schema.org context is left out
+        rdf_graph = Graph().parse(data=json.dumps({"@graph": self.graph["@graph"]}), format="json-ld")
+        return rdf_graph.serialize(format="turtle")
+
+
+class ResultMemory:
+    """In-process LRU of the latest extraction results, keyed by repository and commit."""
+
+    def __init__(self, max_size: int = RESULT_MEMORY_SIZE):
+        self.max_size = max_size
+        self._results: "OrderedDict[tuple, ExtractionResult]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[ExtractionResult]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def set(self, key: tuple, result: ExtractionResult):
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
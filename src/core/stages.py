@@ -0,0 +1,92 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageError(Exception):
+    """Raised when a stage of a StageGraph fails. The original error is chained."""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class StageGraph:
+    """
+    A small DAG of pipeline stages.
+
+    Each stage is a callable receiving the dict of results produced so far, and
+    runs as soon as all the stages it depends on are finished. Independent
+    stages run concurrently, so the wall time is that of the slowest branch.
+    A stage added with a `when` condition is skipped (its result is None) when
+    the condition, evaluated on the results of its dependencies, is false.
+
+    >>> graph = StageGraph()
+    >>> graph.add("a", lambda r: 1)
+    >>> graph.add("b", lambda r: r["a"] + 1, after=["a"])
+    >>> graph.run()["b"]
+    2
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Callable[[dict], object]] = {}
+        self.dependencies: Dict[str, tuple] = {}
+        self.conditions: Dict[str, Optional[Callable[[dict], bool]]] = {}
+
+    def add(self, name: str, func: Callable[[dict], object], after: Iterable[str] = (),
+            when: Optional[Callable[[dict], bool]] = None):
+        after = tuple(after)
+        unknown = [dep for dep in after if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {unknown}")
+        self.stages[name] = func
+        self.dependencies[name] = after
+        self.conditions[name] = when
+
+    def run(self, on_stage: Optional[Callable[[str, str], None]] = None) -> dict:
+        """Run every stage and return their results by name. Raises StageError on the first failure."""
+        results = {}
+        pending = dict(self.dependencies)
+        running = {}
+
+        def notify(stage, status):
+            if on_stage is not None:
+                on_stage(stage, status)
+
+        executor = ThreadPoolExecutor(max_workers=max(len(self.stages), 1), thread_name_prefix="stage")
+        try:
+            while pending or running:
+                # Skipped stages complete at once and may make further stages ready
+                ready = True
+                while ready:
+                    ready = [name for name, deps in pending.items() if all(dep in results for dep in deps)]
+                    for name in ready:
+                        del pending[name]
+                        condition = self.conditions[name]
+                        if condition is not None and not condition(dict(results)):
+                            results[name] = None
+                            notify(name, "skipped")
+                            continue
+                        notify(name, "running")
+                        running[executor.submit(self.stages[name], dict(results))] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        notify(name, "failed")
+                        raise StageError(name, e) from e
+                    notify(name, "done")
+                    logger.debug(f"Stage {name} finished")
+        except BaseException:
+            # Report the failure without waiting for the stages still running
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+
+        return results
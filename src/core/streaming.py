@@ -0,0 +1,90 @@
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Chunks of the completion are fed as they arrive, and every top-level
+    member of the object is returned as soon as its value is complete, without
+    waiting for the rest of the document. A leading Markdown code fence is
+    tolerated. Malformed output raises ValueError, so that a stream going off
+    the rails can be aborted early.
+
+    >>> parser = IncrementalJSONParser()
+    >>> parser.feed('{"name": "demo", "author": [{"na')
+    [('name', 'demo')]
+    >>> parser.feed('me": "A"}]}')
+    [('author', [{'name': 'A'}])]
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.finished = False
+        self.member_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        members = []
+
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+
+            if not self.started:
+                if char == "{":
+                    self.started = True
+                    self.depth = 1
+                    self.member_start = self.pos + 1
+                elif not char.isspace() and not self._in_code_fence():
+                    raise ValueError(f"Unexpected output before the JSON object: {self.text[:self.pos + 1]!r}")
+            elif self.finished:
+                if not char.isspace() and char != "`":
+                    raise ValueError("Unexpected output after the JSON object")
+            elif self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    members.extend(self._parse_member(self.pos))
+                    self.finished = True
+            elif char == "," and self.depth == 1:
+                members.extend(self._parse_member(self.pos))
+                self.member_start = self.pos + 1
+
+            self.pos += 1
+
+        return members
+
+    def _in_code_fence(self) -> bool:
+        return "```json".startswith(self.text[:self.pos + 1].strip())
+
+    def _parse_member(self, end: int) -> List[Tuple[str, Any]]:
+        member = self.text[self.member_start:end]
+        if not member.strip():
+            return []
+        try:
+            return list(json.loads("{" + member + "}").items())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Malformed JSON member {member[:80]!r}: {e}") from e
+
+    def result(self) -> dict:
+        """The whole object, once the stream is complete."""
+        if not self.finished:
+            raise ValueError("The JSON object is incomplete")
+        start = self.text.index("{")
+        return json.loads(self.text[start:self.text.rindex("}") + 1])
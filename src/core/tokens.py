@@ -0,0 +1,120 @@
+import math
+import logging
+from functools import lru_cache
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "cl100k_base"
+
+# Typical number of characters per token for ASCII source code and prose
+CHARS_PER_TOKEN = 4
+# Pessimistic ratio: below this, ASCII text is very unlikely to produce more tokens
+MIN_CHARS_PER_TOKEN = 2
+# Optimistic ratio, used to size the window that is encoded near the budget limit
+MAX_CHARS_PER_TOKEN = 8
+
+
+@lru_cache(maxsize=None)
+def get_encoder(name: str = ENCODING_NAME):
+    """Return the tiktoken encoding, built once per process."""
+    return tiktoken.get_encoding(name)
+
+
+class TokenBudget:
+    """
+    Incremental token budget used while assembling a prompt.
+
+    ASCII texts are only estimated from their length (CHARS_PER_TOKEN) as long
+    as, even at the pessimistic ratio, everything taken so far stays within the
+    budget. Once it may not, the texts taken since the last check are encoded
+    once to get the exact count, so the budget is never exceeded nor wasted.
+    Exact encoding is otherwise reserved for non-ASCII text and for the text
+    that reaches the limit, of which only a window of the remaining size is encoded.
+    """
+
+    def __init__(self, max_tokens: int, encoder=None):
+        self.max_tokens = max_tokens
+        self.used = 0
+        self.exhausted = False
+        self._encoder = encoder
+        # Tokens counted exactly, texts taken on estimate since, and an upper bound of the total
+        self._counted = 0
+        self._estimated = []
+        self._bound = 0
+
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            self._encoder = get_encoder()
+        return self._encoder
+
+    @property
+    def remaining(self) -> int:
+        return max(self.max_tokens - self.used, 0)
+
+    def char_limit(self) -> int:
+        """Number of characters beyond which a text certainly does not fit anymore."""
+        return self.remaining * MAX_CHARS_PER_TOKEN
+
+    def _encode(self, text: str):
+        return self.encoder.encode(text, disallowed_special=())
+
+    def _charge(self, tokens: int, bound: int):
+        self.used += tokens
+        self._bound += bound
+
+    def _count_estimated(self):
+        """Replace the estimates of the texts taken so far with their exact count."""
+        if self._estimated:
+            self._counted += len(self._encode("".join(self._estimated)))
+            self._estimated = []
+        self.used = self._bound = self._counted
+
+    def take(self, text: str, closing: str = "") -> str:
+        """
+        Consume budget for `text` and return the part of it that fits. When `text`
+        is truncated, `closing` (its last characters, e.g. a closing tag) is kept.
+        """
+        if self.exhausted:
+            return ""
+
+        # Clearly fits: even at the pessimistic ratio the total stays within the budget
+        pessimistic = math.ceil(len(text) / MIN_CHARS_PER_TOKEN)
+        if text.isascii() and self._bound + pessimistic <= self.max_tokens:
+            self._estimated.append(text)
+            self._charge(math.ceil(len(text) / CHARS_PER_TOKEN), pessimistic)
+            return text
+
+        self._count_estimated()
+        remaining = self.max_tokens - self._counted
+        if remaining <= 0:
+            self.exhausted = True
+            return ""
+        if text.isascii() and pessimistic <= remaining:
+            self._estimated.append(text)
+            self._charge(math.ceil(len(text) / CHARS_PER_TOKEN), pessimistic)
+            return text
+
+        window = text[:remaining * MAX_CHARS_PER_TOKEN]
+        tokens = self._encode(window)
+        if len(window) < len(text) and len(tokens) <= remaining:
+            # Denser than expected, the window was too small to decide
+            tokens = self._encode(text)
+
+        if len(tokens) <= remaining:
+            self._counted += len(tokens)
+            self._charge(len(tokens), len(tokens))
+            return text
+
+        self._counted = self.used = self._bound = self.max_tokens
+        self.exhausted = True
+        logger.warning(f"Token budget of {self.max_tokens} reached, truncating input")
+        if not closing:
+            return self.encoder.decode(tokens[:remaining])
+
+        kept = remaining - len(self._encode(closing))
+        if kept <= 0:
+            return ""
+        return self.encoder.decode(tokens[:kept]) + closing
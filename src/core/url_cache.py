@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..utils.cache import CACHE_DIR, DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Set URL_CACHE_PATH to an empty string to keep the cache in memory only
+URL_CACHE_PATH = os.environ.get("URL_CACHE_PATH", os.path.join(CACHE_DIR, "urls.sqlite"))
+URL_CACHE_TTL_OK = float(os.environ.get("URL_CACHE_TTL_OK", 24 * 3600))
+URL_CACHE_TTL_FAIL = float(os.environ.get("URL_CACHE_TTL_FAIL", 3600))
+URL_CACHE_MEMORY_SIZE = int(os.environ.get("URL_CACHE_MEMORY_SIZE", 10000))
+
+
+class UrlStatusCache:
+    """
+    Cross-request cache of URL liveness.
+
+    Reachable and unreachable results have separate TTLs, so that dead links
+    are re-checked sooner. Results are kept in a bounded in-memory LRU of
+    `memory_size` URLs and, when `path` is set, in a SQLite file shared by
+    workers and surviving restarts. A stale in-memory entry falls back to the
+    file, where another worker may have stored a newer result. The latency of
+    each probe is recorded per host. The SQLite file is only opened on first use.
+    """
+
+    def __init__(self, path: Optional[str] = URL_CACHE_PATH,
+                 ttl_ok: float = URL_CACHE_TTL_OK,
+                 ttl_fail: float = URL_CACHE_TTL_FAIL,
+                 memory_size: int = URL_CACHE_MEMORY_SIZE):
+        self.path = path
+        self.ttl_ok = ttl_ok
+        self.ttl_fail = ttl_fail
+        self.memory_size = memory_size
+        self.memory: "OrderedDict[str, tuple]" = OrderedDict()
+        # Number of probes and their total duration, per host
+        self.host_latency: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    @cached_property
+    def store(self) -> Optional[DiskCache]:
+        if not self.path:
+            return None
+        return DiskCache(self.path, max_age=max(self.ttl_ok, self.ttl_fail))
+
+    def _fresh(self, ok: bool, checked_at: float) -> bool:
+        ttl = self.ttl_ok if ok else self.ttl_fail
+        return time.time() - checked_at <= ttl
+
+    def _remember(self, url: str, entry: tuple):
+        with self._lock:
+            self.memory[url] = entry
+            self.memory.move_to_end(url)
+            while len(self.memory) > self.memory_size:
+                self.memory.popitem(last=False)
+
+    def get(self, url: str) -> Optional[bool]:
+        """Return the cached reachability of `url`, or None if unknown or stale."""
+        with self._lock:
+            entry = self.memory.get(url)
+            if entry is not None:
+                if self._fresh(*entry):
+                    self.memory.move_to_end(url)
+                    return entry[0]
+                del self.memory[url]
+
+        if self.store is None:
+            return None
+        stored = self.store.get(url)
+        if stored is None or not self._fresh(stored["ok"], stored["checked_at"]):
+            return None
+        self._remember(url, (stored["ok"], stored["checked_at"]))
+        return stored["ok"]
+
+    def set(self, url: str, ok: bool, latency: Optional[float] = None):
+        checked_at = time.time()
+        self._remember(url, (ok, checked_at))
+        if self.store is not None:
+            self.store.set(url, {"ok": ok, "checked_at": checked_at})
+        if latency is not None:
+            self.record_latency(urlparse(url).netloc, latency)
+
+    def record_latency(self, host: str, seconds: float):
+        with self._lock:
+            count, total = self.host_latency.get(host, (0, 0.0))
+            self.host_latency[host] = (count + 1, total + seconds)
+
+    def latency_stats(self, hosts: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """Average probe latency in seconds, per host, for all hosts or only `hosts`."""
+        with self._lock:
+            latency = self.host_latency
+            if hosts is not None:
+                latency = {host: latency[host] for host in hosts if host in latency}
+            return {host: total / count for host, (count, total) in latency.items()}
+
+
+url_status_cache = UrlStatusCache()
@@ -1,10 +1,31 @@
+import os
 import re
 import requests
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
 
+from .url_cache import url_status_cache
+
 logger = logging.getLogger(__name__)
 
+URL_CHECK_TIMEOUT = float(os.environ.get("URL_CHECK_TIMEOUT", 5))
+URL_CHECK_DEADLINE = float(os.environ.get("URL_CHECK_DEADLINE", 15))
+URL_CHECK_WORKERS = int(os.environ.get("URL_CHECK_WORKERS", 16))
+URL_CHECK_PER_HOST = int(os.environ.get("URL_CHECK_PER_HOST", 4))
+
+# Status codes of hosts that do not support HEAD requests properly
+HEAD_REJECTED_STATUSES = (403, 405, 501)
+
+# Shared between verifications so that connections to the same hosts and the threads are reused
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=URL_CHECK_WORKERS, pool_maxsize=URL_CHECK_PER_HOST))
+_session.mount("https://", HTTPAdapter(pool_connections=URL_CHECK_WORKERS, pool_maxsize=URL_CHECK_PER_HOST))
+_executor = ThreadPoolExecutor(max_workers=URL_CHECK_WORKERS, thread_name_prefix="url-check")
+
 class Verification:
     def __init__(self, metadata: dict):
         self.data = metadata
@@ -166,12 +187,49 @@ class Verification:
             if isinstance(urls, list):
                 all_urls.extend([u for u in urls if isinstance(u, str)])
 
-        for url in all_urls:
-            if not self._url_responds(url):
+        # Each distinct URL is checked once
+        reachable = self._check_urls(list(dict.fromkeys(all_urls)))
+
+        for url, ok in reachable.items():
+            if not ok:
                 msg = f"Unreachable URL: {url}"
                 logger.warning(msg)
                 self.warnings.append(msg)
 
+    def _check_urls(self, urls, deadline=URL_CHECK_DEADLINE):
+        """
+        Check URLs concurrently, with at most URL_CHECK_PER_HOST requests per host.
+        URLs still pending after `deadline` seconds are reported as unreachable.
+        """
+        if not urls:
+            return {}
+
+        host_limits = {urlparse(url).netloc: threading.BoundedSemaphore(URL_CHECK_PER_HOST) for url in urls}
+
+        deadline_at = time.monotonic() + deadline
+
+        def probe(url):
+            with host_limits[urlparse(url).netloc]:
+                return self._url_responds(url, deadline_at)
+
+        futures = {_executor.submit(probe, url): url for url in urls}
+        done, not_done = wait(futures, timeout=deadline)
+        for future in not_done:
+            # Checks that have not started yet are dropped; running ones finish in the background
+            future.cancel()
+
+        results = {url: False for url in urls}
+        for future in done:
+            results[futures[future]] = future.result()
+        if not_done:
+            logger.warning(f"URL checks still pending after {deadline}s: {[futures[f] for f in not_done]}")
+
+        latency = url_status_cache.latency_stats(host_limits)
+        if latency:
+            logger.info("Average URL check latency: " + ", ".join(f"{host} {seconds:.2f}s" for host, seconds in latency.items()))
+
+        return results
+
     def sanitize_metadata(self):
         logger.info("Sanitizing metadata...")
         clean_data = self.data.copy()
@@ -253,9 +311,25 @@ class Verification:
         except:
             return False
 
-    def _url_responds(self, url):
+    def _url_responds(self, url, deadline_at=None):
+        cached = url_status_cache.get(url)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        ok = self._probe_url(url)
+        # A probe ending after the deadline was already reported as unreachable, so it is not cached
+        if deadline_at is None or time.monotonic() <= deadline_at:
+            url_status_cache.set(url, ok, latency=time.perf_counter() - start)
+        return ok
+
+    def _probe_url(self, url):
         try:
-            response = requests.head(url, timeout=5)
+            response = _session.head(url, timeout=URL_CHECK_TIMEOUT, allow_redirects=True)
+            if response.status_code in HEAD_REJECTED_STATUSES:
+                # Some hosts reject HEAD; only fetch the headers of a GET
+                with _session.get(url, timeout=URL_CHECK_TIMEOUT, stream=True) as response:
+                    return response.status_code < 400
             return response.status_code < 400
         except requests.RequestException:
             return False
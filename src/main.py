@@ -1,44 +1,175 @@
 import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from utils.utils import fetch_jsonld, merge_jsonld
-from core.genai_model import llm_request_repo_infos
+from typing import List, Optional, Set
+
+if __package__ in (None, ""):
+    # Allow running as `python src/main.py` as well as `python -m src.main`
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.utils import fetch_jsonld, merge_jsonld
+from src.core.gimie_methods import extract_gimie
+from src.core.genai_model import llm_request_repo_infos
 import logging
-from utils.logging_config import setup_logging
+from src.utils.logging_config import setup_logging
 
 # Environment variables
-GIMIE_ENDPOINT = "http://imagingplazadev.epfl.ch:7511/gimie/jsonld/"
+# Remote GIMIE backend (e.g. "http://host:1234/v1/gimie/"); GIMIE runs in-process when unset
+GIMIE_ENDPOINT = os.environ.get("GIMIE_ENDPOINT") or None
 DEFAULT_REPO = "https://github.com/qchapp/lungs-segmentation"
 DEFAULT_OUTPUT_PATH = "output_file.json"
+DEFAULT_JOBS = 4
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
-def main(url: str, output_path: Path) -> None:
-    """Retrieving repo infos using gimie + gemini and outputting it in the specified path."""
+def extract_gimie_graph(url: str, gimie_endpoint: Optional[str] = None) -> list:
+    """GIMIE JSON-LD graph of a repository, from the remote endpoint if one is given."""
+    if gimie_endpoint:
+        logger.info(f"Fetching JSON-LD data from GIMIE endpoint {gimie_endpoint} for {url}")
+        return fetch_jsonld(gimie_endpoint + url)
+
+    logger.info(f"Running GIMIE for {url}")
+    return extract_gimie(url, format="json-ld")
 
-    logger.info(f"Fetching JSON-LD data from GIMIE for {url}")
-    jsonld_gimie_data = fetch_jsonld(GIMIE_ENDPOINT + url)
+
+def extract_repository(url: str, gimie_endpoint: Optional[str] = None) -> dict:
+    """Retrieve the repo infos using gimie + gemini and return the merged JSON-LD."""
+
+    jsonld_gimie_data = extract_gimie_graph(url, gimie_endpoint)
 
     logger.info("Fetching Gemini response for repository...")
     llm_result = llm_request_repo_infos(url)
 
     if not llm_result:
-        logger.error("LLM returned no data. Aborting.")
+        raise RuntimeError("LLM returned no data")
+
+    return merge_jsonld(jsonld_gimie_data, llm_result)
+
+
+def main(url: str, output_path: Path, gimie_endpoint: Optional[str] = None) -> None:
+    """Retrieving repo infos using gimie + gemini and outputting it in the specified path."""
+
+    try:
+        merged_jsonld = extract_repository(url, gimie_endpoint)
+    except RuntimeError as e:
+        logger.error(f"{e}. Aborting.")
         return
 
-    logger.info("Merging and saving output to JSON-LD...")
-    merge_jsonld(jsonld_gimie_data, llm_result, output_path)
+    logger.info("Saving output to JSON-LD...")
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(merged_jsonld, f, indent=4)
+    logger.info(f"✅ Merged JSON-LD written to {output_path}")
+
+
+def read_urls(path: Path) -> List[str]:
+    """Read one URL per line, skipping blank lines, comments and duplicates."""
+    urls = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            url = line.strip()
+            if url and not url.startswith("#") and url not in urls:
+                urls.append(url)
+    return urls
+
+
+def read_checkpoint(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def run_batch(input_path: Path, out_path: Path, checkpoint_path: Path, jobs: int = DEFAULT_JOBS,
+              gimie_endpoint: Optional[str] = None) -> dict:
+    """
+    Extract every repository listed in `input_path` on a pool of `jobs` processes.
+
+    Each result is appended to `out_path` as one JSON line as soon as it is
+    ready, and successful URLs are appended to `checkpoint_path`. URLs already
+    in the checkpoint are skipped, so an interrupted run resumes where it
+    stopped; failed URLs are retried on the next run.
+    """
+    urls = read_urls(input_path)
+    completed = read_checkpoint(checkpoint_path)
+    pending = [url for url in urls if url not in completed]
+    logger.info(f"{len(pending)} repositories to extract, {len(urls) - len(pending)} already done")
+
+    failures = {}
+    succeeded = 0
+    start = time.perf_counter()
+
+    # Workers are reused for many repositories, so the imports are only paid once per process
+    with ProcessPoolExecutor(max_workers=jobs) as executor, \
+            open(out_path, "a", encoding="utf-8") as out, \
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        futures = {executor.submit(extract_repository, url, gimie_endpoint): url for url in pending}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                record = {"link": url, "output": future.result()}
+            except Exception as e:
+                logger.error(f"Extraction of {url} failed: {e}")
+                failures[url] = str(e)
+                record = {"link": url, "error": str(e)}
+
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            if "output" in record:
+                # Written after the result, so a crash in between only repeats the extraction
+                checkpoint.write(url + "\n")
+                checkpoint.flush()
+                succeeded += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        "total": len(urls),
+        "skipped": len(urls) - len(pending),
+        "succeeded": succeeded,
+        "failed": failures,
+        "seconds": elapsed,
+    }
+
+
+def print_summary(summary: dict) -> None:
+    processed = summary["succeeded"] + len(summary["failed"])
+    rate = processed / summary["seconds"] * 60 if summary["seconds"] > 0 else 0.0
+
+    print(f"Processed {processed} repositories in {summary['seconds']:.1f}s ({rate:.1f} per minute)")
+    print(f"Succeeded: {summary['succeeded']}, failed: {len(summary['failed'])}, "
+          f"skipped (already done): {summary['skipped']}, total: {summary['total']}")
+    for url, error in summary["failed"].items():
+        print(f"  FAILED {url}: {error}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Fetch and process repository information.")
     parser.add_argument("--url", default=DEFAULT_REPO, help="GitHub repository URL")
     parser.add_argument("--output_path", default=DEFAULT_OUTPUT_PATH, help="Path to save the output jsonLD file")
-    
+    parser.add_argument("--input", help="File listing one repository URL per line (batch mode)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Number of worker processes in batch mode")
+    parser.add_argument("--out", default="results.jsonl", help="JSON Lines file the batch results are appended to")
+    parser.add_argument("--gimie-endpoint", default=GIMIE_ENDPOINT,
+                        help="Fetch GIMIE output from this remote endpoint instead of running GIMIE in-process")
+    parser.add_argument("--checkpoint", help="File of completed URLs, used to resume a batch (default: <out>.checkpoint)")
+
     args = parser.parse_args()
+
+    if args.input:
+        out_path = Path(args.out)
+        checkpoint_path = Path(args.checkpoint or f"{args.out}.checkpoint")
+        summary = run_batch(Path(args.input), out_path, checkpoint_path, jobs=args.jobs,
+                            gimie_endpoint=args.gimie_endpoint)
+        print_summary(summary)
+        sys.exit(1 if summary["failed"] else 0)
+
     output_path = Path(args.output_path)
     url = args.url
 
-    main(url, output_path)
\ No newline at end of file
+    main(url, output_path, gimie_endpoint=args.gimie_endpoint)
@@ -0,0 +1,123 @@
+import asyncio
+import gc
+import threading
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import api
+from src.core.admission import AdmissionController, OverloadedError
+from src.core.batch import run_batch
+
+
+def test_requests_beyond_capacity_are_rejected():
+    controller = AdmissionController(max_in_flight=1, max_queued=1, retry_after=7)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.ensure_future(controller.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(OverloadedError) as error:
+            await controller.run(release.wait)
+        assert error.value.retry_after == 7
+
+        release.set()
+        await asyncio.gather(*running)
+        assert controller.admitted == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_request_keeps_its_slot_until_the_work_ends():
+    controller = AdmissionController(max_in_flight=1, max_queued=0)
+    started, release = threading.Event(), threading.Event()
+
+    def work():
+        started.set()
+        release.wait()
+
+    async def scenario():
+        task = asyncio.ensure_future(controller.run(work))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        await asyncio.sleep(0.05)
+
+        # The thread is still busy, so the slot is still taken
+        assert controller.admitted == 1
+        with pytest.raises(OverloadedError):
+            await controller.run(work)
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert controller.admitted == 0
+
+    asyncio.run(scenario())
+
+
+def test_overloaded_api_answers_503_with_retry_after():
+    client = TestClient(api.app)
+    with mock.patch.object(api, "admission", AdmissionController(max_in_flight=1, max_queued=0, retry_after=12)) as full:
+        full.admitted = full.capacity
+        response = client.get("/v1/extract/json-ld/https://github.com/foo/bar")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
+
+
+def test_stream_releases_its_slot_when_never_iterated():
+    controller = AdmissionController(max_in_flight=1, max_queued=0)
+
+    async def scenario():
+        # The client went away before the response started
+        stream = controller.stream(lambda: iter([1, 2]))
+        assert controller.admitted == 1
+        del stream
+        gc.collect()
+        assert controller.admitted == 0
+
+        stream = controller.stream(lambda: iter([1, 2]))
+        await stream.aclose()
+        assert controller.admitted == 0
+
+        stream = controller.stream(lambda: iter([1, 2]))
+        assert [item async for item in stream] == [1, 2]
+        assert controller.admitted == 0
+
+    asyncio.run(scenario())
+
+
+def test_closed_batch_frees_each_slot_when_its_work_ends():
+    controller = AdmissionController(max_in_flight=2, max_queued=0)
+    urls = ["https://github.com/a/fast", "https://gitlab.com/b/slow", "https://codeberg.org/c/slow"]
+    started = {url: threading.Event() for url in urls}
+    release = {url: threading.Event() for url in urls}
+    release[urls[0]].set()
+
+    def extract(url):
+        started[url].set()
+        release[url].wait()
+        return url
+
+    async def wait_for(predicate):
+        for _ in range(100):
+            if predicate():
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("timed out")
+
+    async def scenario():
+        stream = controller.stream(run_batch, urls, extract, max_workers=2, slots=2, in_pool=False)
+        assert (await stream.__anext__())["link"] == urls[0]
+        await asyncio.get_running_loop().run_in_executor(None, started[urls[2]].wait)
+
+        # The client went away while two extractions are still running
+        await stream.aclose()
+        assert controller.admitted == 2
+
+        release[urls[1]].set()
+        await wait_for(lambda: controller.admitted == 1)
+        release[urls[2]].set()
+        await wait_for(lambda: controller.admitted == 0)
+
+    asyncio.run(scenario())
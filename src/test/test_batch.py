@@ -0,0 +1,87 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.batch import HostLimiter, run_batch
+
+
+def test_results_stream_in_completion_order():
+    delays = {"https://github.com/a/slow": 0.5, "https://gitlab.com/b/fast": 0.0}
+
+    def extract(url):
+        time.sleep(delays[url])
+        return url.upper()
+
+    outcomes = list(run_batch(list(delays), extract))
+
+    assert [outcome["index"] for outcome in outcomes] == [1, 0]
+    assert outcomes[0] == {"index": 1, "link": "https://gitlab.com/b/fast", "output": "HTTPS://GITLAB.COM/B/FAST"}
+
+
+def test_failures_do_not_stop_the_batch():
+    def extract(url):
+        if url.endswith("broken"):
+            raise RuntimeError("clone failed")
+        return {}
+
+    outcomes = sorted(run_batch(["https://github.com/a/broken", "https://github.com/a/ok"], extract),
+                      key=lambda outcome: outcome["index"])
+
+    assert outcomes[0]["error"] == "clone failed"
+    assert outcomes[1]["output"] == {}
+
+
+def test_per_host_limit():
+    lock = threading.Lock()
+    running = {}
+    peak = {}
+
+    def extract(url):
+        host = url.split("/")[2]
+        with lock:
+            running[host] = running.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), running[host])
+        time.sleep(0.05)
+        with lock:
+            running[host] -= 1
+        return host
+
+    urls = [f"https://github.com/a/{i}" for i in range(6)] + [f"https://gitlab.com/b/{i}" for i in range(6)]
+    outcomes = list(run_batch(urls, extract, max_workers=4, per_host=2))
+
+    assert len(outcomes) == 12
+    assert peak == {"github.com": 2, "gitlab.com": 2}
+
+
+def test_per_host_limit_is_shared_between_batches():
+    limiter = HostLimiter()
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def extract(url):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return url
+
+    def batch(prefix):
+        urls = [f"https://github.com/{prefix}/{i}" for i in range(4)]
+        return list(run_batch(urls, extract, max_workers=4, per_host=2, limiter=limiter))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(batch, ["a", "b"]))
+
+    assert [len(outcomes) for outcomes in results] == [4, 4]
+    assert peak[0] == 2
+
+
+def test_extractions_run_on_the_given_pool():
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared") as shared:
+        outcomes = list(run_batch(["https://github.com/a/1", "https://gitlab.com/b/2"],
+                                  lambda url: threading.current_thread().name, submit=shared.submit))
+
+    assert all(outcome["output"].startswith("shared") for outcome in outcomes)
@@ -0,0 +1,81 @@
+import time
+
+from src.utils.cache import DiskCache
+from src.utils.utils import normalize_repo_url
+from src.core.url_cache import UrlStatusCache
+
+
+def test_roundtrip(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    cache.set("a", {"@graph": [1, 2]})
+    assert cache.get("a") == {"@graph": [1, 2]}
+    assert cache.get("missing") is None
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_age=0.05)
+    cache.set("a", 1)
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_size_budget_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=250)
+    cache.set("old", "x" * 100)
+    cache.set("recent", "y" * 100)
+    cache.get("old")
+    cache.set("new", "z" * 100)
+
+    assert cache.get("recent") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
+
+
+def test_normalize_repo_url():
+    assert normalize_repo_url("https://GitHub.com/Imaging-Plaza/repo.git/") == "https://github.com/Imaging-Plaza/repo"
+    assert normalize_repo_url("https://github.com/Imaging-Plaza/repo") == "https://github.com/Imaging-Plaza/repo"
+
+
+def test_url_status_cache_uses_separate_ttls(tmp_path):
+    cache = UrlStatusCache(path=str(tmp_path / "urls.sqlite"), ttl_ok=60, ttl_fail=0.05)
+    cache.set("https://spdx.org/licenses/MIT", True, latency=0.2)
+    cache.set("https://example.org/dead", False)
+    time.sleep(0.1)
+
+    assert cache.get("https://spdx.org/licenses/MIT") is True
+    assert cache.get("https://example.org/dead") is None
+    assert cache.latency_stats() == {"spdx.org": 0.2}
+
+    # Persisted results are visible to another worker
+    other = UrlStatusCache(path=str(tmp_path / "urls.sqlite"), ttl_ok=60, ttl_fail=0.05)
+    assert other.get("https://spdx.org/licenses/MIT") is True
+
+
+def test_url_status_memory_is_bounded(tmp_path):
+    cache = UrlStatusCache(path=None, memory_size=2)
+    cache.set("https://a.org/", True)
+    cache.set("https://b.org/", True)
+    assert cache.get("https://a.org/") is True
+    cache.set("https://c.org/", False)
+
+    assert list(cache.memory) == ["https://a.org/", "https://c.org/"]
+    assert cache.get("https://b.org/") is None
+
+
+def test_stale_memory_entry_reads_newer_result_from_disk(tmp_path):
+    path = str(tmp_path / "urls.sqlite")
+    cache = UrlStatusCache(path=path, ttl_ok=60, ttl_fail=0.05)
+    cache.set("https://example.org/flaky", False)
+    time.sleep(0.1)
+    UrlStatusCache(path=path, ttl_ok=60, ttl_fail=0.05).set("https://example.org/flaky", True)
+
+    assert cache.get("https://example.org/flaky") is True
+
+
+def test_url_status_cache_opens_its_file_on_first_use(tmp_path):
+    path = tmp_path / "urls.sqlite"
+    cache = UrlStatusCache(path=str(path))
+    assert not path.exists()
+
+    cache.set("https://example.org", True)
+    assert path.exists()
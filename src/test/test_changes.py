@@ -0,0 +1,116 @@
+import subprocess
+from unittest import mock
+
+from src.core.changes import is_metadata_relevant, relevant_changes
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, text=True).stdout.strip()
+
+
+def commit(repo, path, content):
+    target = repo / path
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content)
+    git(repo, "add", "-A")
+    git(repo, "-c", "user.name=t", "-c", "user.email=t@example.org", "commit", "-q", "-m", f"Update {path}")
+    return git(repo, "rev-parse", "HEAD")
+
+
+def test_classification():
+    relevant = ["README.md", "docs/index.html", "CITATION.cff", "pyproject.toml", "requirements-dev.txt",
+                "examples/demo.ipynb", "LICENSE", "src/pkg/guide.rst"]
+    unrelated = ["src/model.py", "tests/test_model.py", ".github/workflows/ci.yml", "src/readers/tiff.c"]
+
+    assert all(is_metadata_relevant(path) for path in relevant)
+    assert not any(is_metadata_relevant(path) for path in unrelated)
+
+
+def test_relevant_changes_in_a_shallow_checkout(tmp_path):
+    origin = tmp_path / "origin"
+    origin.mkdir()
+    git(origin, "init", "-q")
+    first = commit(origin, "README.md", "# Demo\n")
+    commit(origin, "src/model.py", "x = 1\n")
+
+    def shallow_checkout(name):
+        checkout = tmp_path / name
+        subprocess.run(["git", "clone", "-q", "--depth", "1", f"file://{origin}", str(checkout)], check=True)
+        return str(checkout)
+
+    assert relevant_changes(shallow_checkout("code-only"), first) == []
+
+    commit(origin, "docs/usage.md", "Usage\n")
+    checkout = shallow_checkout("with-docs")
+    assert relevant_changes(checkout, first) == ["docs/usage.md"]
+
+    assert relevant_changes(checkout, "0" * 40) is None
+
+
+def run_with_previous(previous, gimie_graph):
+    from src.core import pipeline
+
+    with mock.patch.object(pipeline, "clone_repo", return_value="/checkout"), \
+            mock.patch.object(pipeline, "needs_history", return_value=False), \
+            mock.patch.object(pipeline, "extract_gimie", return_value=gimie_graph), \
+            mock.patch.object(pipeline, "relevant_changes", return_value=[]), \
+            mock.patch.object(pipeline, "extract_local_metadata", return_value={}), \
+            mock.patch.object(pipeline, "pack_repository", return_value="packed"), \
+            mock.patch.object(pipeline, "request_llm", return_value={"name": "bar"}) as llm, \
+            mock.patch.object(pipeline, "verify_metadata", side_effect=lambda data: data), \
+            mock.patch.object(pipeline, "metadata_to_jsonld", return_value={"fresh": True}), \
+            mock.patch.object(pipeline, "merge_jsonld", side_effect=lambda gimie, llm_result: llm_result):
+        results = pipeline.build_extraction_graph("https://github.com/foo/bar", "/work", previous).run()
+    return results["merge"], llm.call_count
+
+
+def test_previous_result_is_reused_only_while_gimie_covers_its_exclusions():
+    from src.core.registry import get_registry
+
+    description = get_registry().field_iris["description"]
+    with_description = [{"@id": "https://github.com/foo/bar", "@type": ["http://schema.org/SoftwareSourceCode"],
+                         description: [{"@value": "A tool"}]}]
+    without_description = [{**with_description[0]}]
+    del without_description[0][description]
+    previous = {"commit": "a" * 40, "llm": {"reused": True}, "gimie_fields": ["description"]}
+
+    assert run_with_previous(previous, with_description) == ({"reused": True}, 0)
+    # GIMIE no longer gives the description, which the previous result was not asked for
+    assert run_with_previous(previous, without_description) == ({"fresh": True}, 1)
+    # Results stored before the GIMIE fields were recorded are not reused
+    assert run_with_previous({"commit": "a" * 40, "llm": {"reused": True}}, with_description) == ({"fresh": True}, 1)
+
+
+def test_second_extraction_reuses_the_stored_llm_result(tmp_path):
+    from src.core import pipeline
+    from src.core.registry import get_registry
+    from src.core.result_cache import ResultCache
+
+    iris = get_registry().field_iris
+    repo = "https://github.com/foo/bar"
+
+    def gimie(*args, **kwargs):
+        # A fresh graph per run, as GIMIE returns
+        return [{"@id": repo, "@type": ["http://schema.org/SoftwareSourceCode"], iris["name"]: [{"@value": "bar"}]}]
+
+    llm_jsonld = {iris["description"]: [{"@value": "A tool"}], iris["featureList"]: [{"@value": "Segmentation"}]}
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"))
+
+    with mock.patch.object(pipeline, "result_cache", cache), \
+            mock.patch.object(pipeline, "clone_repo", return_value=str(tmp_path)), \
+            mock.patch.object(pipeline, "needs_history", return_value=False), \
+            mock.patch.object(pipeline, "extract_gimie", side_effect=gimie), \
+            mock.patch.object(pipeline, "relevant_changes", return_value=[]), \
+            mock.patch.object(pipeline, "extract_local_metadata", return_value={}), \
+            mock.patch.object(pipeline, "pack_repository", return_value="packed"), \
+            mock.patch.object(pipeline, "request_llm", return_value={"description": "A tool"}) as llm, \
+            mock.patch.object(pipeline, "verify_metadata", side_effect=lambda data: data), \
+            mock.patch.object(pipeline, "metadata_to_jsonld", side_effect=lambda data: dict(llm_jsonld)), \
+            mock.patch.object(pipeline, "checkout_head_sha", side_effect=["a" * 40, "b" * 40]):
+        first, _ = pipeline._run_pipeline(repo, "a" * 40, None)
+        second, _ = pipeline._run_pipeline(repo, "b" * 40, None)
+
+    assert llm.call_count == 1
+    assert cache.get_latest(repo, pipeline.MODEL)["gimie_fields"] == ["name"]
+    assert second["@graph"][0][iris["description"]] == [{"@value": "A tool"}]
+    assert first == second
@@ -0,0 +1,36 @@
+from unittest import mock
+
+from src import main
+from src.utils.utils import fetch_jsonld
+
+GIMIE_GRAPH = [{"@id": "https://github.com/foo/bar", "@type": ["http://schema.org/SoftwareSourceCode"]}]
+
+
+def test_cli_runs_gimie_in_process_by_default():
+    with mock.patch.object(main, "extract_gimie", return_value=GIMIE_GRAPH) as local, \
+            mock.patch.object(main, "fetch_jsonld") as remote:
+        assert main.extract_gimie_graph("https://github.com/foo/bar") == GIMIE_GRAPH
+
+    local.assert_called_once_with("https://github.com/foo/bar", format="json-ld")
+    remote.assert_not_called()
+
+
+def test_cli_uses_remote_endpoint_when_given():
+    with mock.patch.object(main, "extract_gimie") as local, \
+            mock.patch.object(main, "fetch_jsonld", return_value=GIMIE_GRAPH) as remote:
+        assert main.extract_gimie_graph("https://github.com/foo/bar", "http://gimie:1234/v1/gimie/") == GIMIE_GRAPH
+
+    remote.assert_called_once_with("http://gimie:1234/v1/gimie/https://github.com/foo/bar")
+    local.assert_not_called()
+
+
+def test_fetch_jsonld_decodes_json_output():
+    response = mock.Mock(content=b'{"link": "https://github.com/foo/bar", "output": [{"@id": "https://github.com/foo/bar", '
+                                 b'"@type": ["http://schema.org/SoftwareSourceCode"]}]}')
+    with mock.patch("src.utils.utils.http_client.get", return_value=response):
+        assert fetch_jsonld("http://gimie/https://github.com/foo/bar") == GIMIE_GRAPH
+
+    # Endpoints sending the graph as a serialized string
+    response.content = b'{"output": "[{\\"@id\\": \\"https://github.com/foo/bar\\", \\"@type\\": [\\"http://schema.org/SoftwareSourceCode\\"]}]"}'
+    with mock.patch("src.utils.utils.http_client.get", return_value=response):
+        assert fetch_jsonld("http://gimie/https://github.com/foo/bar") == GIMIE_GRAPH
@@ -0,0 +1,25 @@
+from src.core.gimie_methods import gimie_covered_fields
+from src.core.registry import get_registry
+
+
+def test_fields_on_the_gimie_node_are_covered():
+    graph = [
+        {"@id": "https://github.com/foo/bar", "@type": ["http://schema.org/SoftwareSourceCode"],
+         "http://schema.org/name": [{"@value": "bar"}],
+         "http://schema.org/license": [{"@id": "https://spdx.org/licenses/MIT"}],
+         "http://schema.org/codeRepository": [{"@id": "https://github.com/foo/bar"}],
+         "http://schema.org/keywords": [{"@value": "imaging"}]},
+        {"@id": "https://github.com/foo", "@type": ["http://schema.org/Person"],
+         "http://schema.org/description": [{"@value": "not the software"}]},
+    ]
+
+    assert gimie_covered_fields(graph) == {"name", "license", "codeRepository"}
+    assert gimie_covered_fields([]) == frozenset()
+
+
+def test_field_iris_follow_the_jsonld_context():
+    iris = get_registry().field_iris
+
+    assert iris["name"] == "http://schema.org/name"
+    assert iris["hasDocumentation"] == "https://w3id.org/okn/o/sd#hasDocumentation"
+    assert iris["isPluginModuleOf"] == "https://imaging-plaza.epfl.ch/ontology#isPluginModuleOf"
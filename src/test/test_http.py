@@ -0,0 +1,85 @@
+import io
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+import requests
+
+from src.utils import http
+from src.utils.http import HTTPClient, parse_retry_after
+
+
+def answer(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+@pytest.fixture
+def sleeps():
+    with mock.patch.object(http.time, "sleep") as sleep:
+        yield sleep
+
+
+def test_retry_after_in_seconds_and_dates():
+    assert parse_retry_after("12") == 12
+    assert parse_retry_after("-3") == 0
+    assert parse_retry_after("soon") is None
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert 110 < parse_retry_after(format_datetime(later, usegmt=True)) <= 120
+    # Dates in the "-0000" zone are parsed as naive datetimes
+    assert 110 < parse_retry_after(later.strftime("%a, %d %b %Y %H:%M:%S -0000")) <= 120
+
+
+def test_server_errors_are_retried_with_retry_after(sleeps):
+    client = HTTPClient(max_retries=3, backoff_max=30)
+    answers = [answer(503, {"Retry-After": "7"}), answer(429, {"Retry-After": "600"}), answer(200)]
+
+    with mock.patch.object(client.session, "request", side_effect=answers) as send:
+        assert client.get("https://api.example.org/").status_code == 200
+
+    assert send.call_count == 3
+    # Retry-After is followed, but never beyond the maximum backoff
+    assert [call.args[0] for call in sleeps.call_args_list] == [7, 30]
+
+
+def test_backoff_grows_and_is_capped():
+    client = HTTPClient(backoff_base=1, backoff_max=10)
+
+    with mock.patch.object(http.random, "uniform", side_effect=lambda low, high: high):
+        assert [client._backoff(attempt) for attempt in range(6)] == [1, 2, 4, 8, 10, 10]
+
+
+def test_last_error_is_raised_once_retries_are_exhausted(sleeps):
+    client = HTTPClient(max_retries=2)
+
+    with mock.patch.object(client.session, "request", side_effect=requests.ConnectionError("down")) as send:
+        with pytest.raises(requests.ConnectionError):
+            client.get("https://api.example.org/")
+    assert send.call_count == 3
+
+    with mock.patch.object(client.session, "request", return_value=answer(404)) as send:
+        with pytest.raises(requests.HTTPError):
+            client.get("https://api.example.org/")
+    assert send.call_count == 1
+
+
+def test_read_timeouts_are_only_retried_for_idempotent_methods(sleeps):
+    client = HTTPClient(max_retries=2)
+
+    with mock.patch.object(client.session, "request", side_effect=requests.ReadTimeout("slow")) as send:
+        with pytest.raises(requests.ReadTimeout):
+            client.post("https://api.example.org/completions", json={})
+    assert send.call_count == 1
+
+    with mock.patch.object(client.session, "request", side_effect=[requests.ReadTimeout("slow"), answer(200)]) as send:
+        assert client.get("https://api.example.org/").status_code == 200
+    assert send.call_count == 2
+
+    # Nothing was sent when the connection could not be made
+    with mock.patch.object(client.session, "request", side_effect=[requests.ConnectTimeout("down"), answer(200)]):
+        assert client.post("https://api.example.org/completions", json={}).status_code == 200
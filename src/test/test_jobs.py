@@ -0,0 +1,104 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import api
+from src.core.jobs import JobManager, QueueFullError
+
+
+def wait_until_done(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.done
+
+
+def test_job_runs_and_records_its_events():
+    def runner(job):
+        job.set_stage("gimie", "done")
+        return {"name": "bar"}
+
+    manager = JobManager(runner, max_workers=1)
+    job = manager.submit("https://github.com/foo/bar")
+    wait_until_done(job)
+
+    assert manager.get(job.id) is job
+    assert job.as_dict()["output"] == {"name": "bar"}
+    assert [event["data"] for event in job.events] == [
+        {"status": "queued"},
+        {"status": "running"},
+        {"stage": "gimie", "status": "done"},
+        {"status": "done"},
+    ]
+
+
+def test_failed_job_keeps_its_error():
+    manager = JobManager(mock.Mock(side_effect=RuntimeError("no repository")), max_workers=1)
+    job = manager.submit("https://github.com/foo/bar")
+    wait_until_done(job)
+
+    assert job.status == "failed" and job.error == "no repository"
+    assert job.events[-1]["data"] == {"status": "failed"}
+
+
+def test_full_queue_rejects_jobs():
+    release = threading.Event()
+    manager = JobManager(lambda job: release.wait(), max_workers=1, max_pending=2)
+    manager.submit("https://github.com/foo/a")
+    manager.submit("https://github.com/foo/b")
+
+    with pytest.raises(QueueFullError):
+        manager.submit("https://github.com/foo/c")
+    release.set()
+
+
+def test_done_job_always_has_its_final_event():
+    manager = JobManager(lambda job: None, max_workers=4, max_pending=200)
+    jobs = [manager.submit(f"https://github.com/foo/{i}") for i in range(200)]
+
+    for job in jobs:
+        while True:
+            finished = job.done
+            events = job.events_since(0)
+            if finished:
+                assert events[-1]["data"] == {"status": "done"}
+                break
+
+
+@pytest.fixture
+def client():
+    def runner(job):
+        job.set_stage("llm", "done")
+        return {"name": "bar"}
+
+    with mock.patch.object(api, "job_manager", JobManager(runner, max_workers=1, max_pending=1)):
+        yield TestClient(api.app)
+
+
+def test_job_endpoints(client):
+    response = client.post("/v1/jobs", json={"url": "https://github.com/foo/bar"})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    wait_until_done(api.job_manager.get(job_id))
+
+    assert client.get(f"/v1/jobs/{job_id}").json()["output"] == {"name": "bar"}
+    assert client.get("/v1/jobs/unknown").status_code == 404
+
+    events = client.get(f"/v1/jobs/{job_id}/events").text
+    assert 'event: stage\ndata: {"stage": "llm", "status": "done"}' in events
+    assert events.index('{"status": "done"}') < events.index("event: result")
+
+
+def test_full_job_queue_answers_429(client):
+    release = threading.Event()
+    api.job_manager.runner = lambda job: release.wait()
+    client.post("/v1/jobs", json={"url": "https://github.com/foo/bar"})
+
+    response = client.post("/v1/jobs", json={"url": "https://github.com/foo/baz"})
+    release.set()
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
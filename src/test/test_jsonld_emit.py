@@ -0,0 +1,90 @@
+import json
+
+from rdflib import BNode, Graph, Literal, Namespace, RDF, URIRef, XSD
+
+from src.utils.utils import graph_to_jsonld
+
+SDO = Namespace("http://schema.org/")
+
+
+def normalized(nodes: list) -> list:
+    """Node list with nodes and values sorted, so that triple order does not matter."""
+    return sorted(
+        (
+            {key: sorted(values, key=json.dumps) if isinstance(values, list) else values
+             for key, values in node.items()}
+            for node in nodes
+        ),
+        key=lambda node: node["@id"],
+    )
+
+
+def rdflib_jsonld(graph: Graph) -> list:
+    return json.loads(graph.serialize(format="json-ld"))
+
+
+def gimie_like_graph() -> Graph:
+    g = Graph()
+    repo = URIRef("https://github.com/foo/bar")
+    author = URIRef("https://github.com/alice")
+    org = URIRef("https://github.com/acme")
+    g.add((repo, RDF.type, SDO.SoftwareSourceCode))
+    g.add((repo, SDO.name, Literal("foo/bar")))
+    g.add((repo, SDO.description, Literal("A tool", lang="en")))
+    g.add((repo, SDO.dateCreated, Literal("2021-03-01T10:00:00", datatype=XSD.dateTime)))
+    g.add((repo, SDO.keywords, Literal("imaging")))
+    g.add((repo, SDO.keywords, Literal("microscopy")))
+    g.add((repo, SDO.license, URIRef("https://spdx.org/licenses/MIT.json")))
+    g.add((repo, SDO.author, author))
+    g.add((author, RDF.type, SDO.Person))
+    g.add((author, RDF.type, SDO.Agent))
+    g.add((author, SDO.name, Literal("Alice")))
+    g.add((author, SDO.affiliation, org))
+    g.add((org, RDF.type, SDO.Organization))
+    g.add((org, SDO.legalName, Literal("Acme")))
+    return g
+
+
+def test_matches_rdflib_serializer():
+    g = gimie_like_graph()
+
+    assert normalized(graph_to_jsonld(g)) == normalized(rdflib_jsonld(g))
+
+
+def test_blank_nodes_and_typed_literals():
+    g = Graph()
+    repo = URIRef("https://example.org/repo")
+    release = BNode("release1")
+    g.add((repo, SDO.version, Literal(3)))
+    g.add((repo, SDO.isAccessibleForFree, Literal(True)))
+    g.add((repo, SDO.fileSize, Literal(1.5, datatype=XSD.double)))
+    g.add((repo, SDO.alternateName, Literal("repo", datatype=XSD.string)))
+    g.add((repo, SDO.releaseNotes, release))
+    g.add((release, SDO.name, Literal("v3")))
+    g.add((release, RDF.type, Literal("not an IRI")))
+
+    emitted = graph_to_jsonld(g)
+
+    assert normalized(emitted) == normalized(rdflib_jsonld(g))
+    assert {"@id": "_:release1"} in next(node for node in emitted if node["@id"] == str(repo))[str(SDO.releaseNotes)]
+
+
+def test_round_trips_to_the_same_graph():
+    g = gimie_like_graph()
+
+    parsed = Graph().parse(data=json.dumps(graph_to_jsonld(g)), format="json-ld")
+
+    assert set(parsed) == set(g)
+
+
+def test_empty_graph_and_collections():
+    assert graph_to_jsonld(Graph()) == rdflib_jsonld(Graph()) == []
+
+    g = Graph()
+    repo = URIRef("https://example.org/repo")
+    head = BNode()
+    g.add((repo, SDO.keywords, head))
+    g.add((head, RDF.first, Literal("a")))
+    g.add((head, RDF.rest, RDF.nil))
+
+    assert normalized(graph_to_jsonld(g)) == normalized(rdflib_jsonld(g))
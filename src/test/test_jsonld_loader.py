@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+from pyld.jsonld import JsonLdError
+
+from src.utils.jsonld_loader import CachedDocumentLoader
+
+CONTEXT = {"@context": {"name": "http://schema.org/name"}}
+
+
+def fetcher(documents, calls):
+    def fetch(url, options):
+        calls.append(url)
+        return {"document": documents[url]}
+    return fetch
+
+
+def test_bundled_contexts_never_reach_the_network(tmp_path):
+    calls = []
+    loader = CachedDocumentLoader(cache_dir=str(tmp_path), fetch=fetcher({}, calls))
+
+    assert "@context" in loader("https://schema.org/")["document"]
+    assert loader("https://schema.org/")["documentUrl"] == "https://schema.org/"
+    assert calls == []
+    assert loader.stats == {"hits": 2, "misses": 0, "rejected": 0}
+
+
+def test_only_allow_listed_urls_are_fetched(tmp_path):
+    calls = []
+    loader = CachedDocumentLoader(cache_dir=str(tmp_path), allowlist=["https://w3id.org/ctx"],
+                                  fetch=fetcher({"https://w3id.org/ctx": CONTEXT}, calls))
+
+    with pytest.raises(JsonLdError):
+        loader("https://example.org/ctx")
+    assert loader("https://w3id.org/ctx")["document"] == CONTEXT
+    assert loader("https://w3id.org/ctx")["document"] == CONTEXT
+
+    assert calls == ["https://w3id.org/ctx"]
+    assert loader.stats == {"hits": 1, "misses": 1, "rejected": 1}
+
+
+def test_fetched_documents_are_served_from_disk_afterwards(tmp_path):
+    calls = []
+    documents = {"https://w3id.org/ctx": CONTEXT}
+    CachedDocumentLoader(cache_dir=str(tmp_path), allowlist=documents,
+                         fetch=fetcher(documents, calls))("https://w3id.org/ctx")
+
+    # Another worker, with the allow-list emptied
+    other = CachedDocumentLoader(cache_dir=str(tmp_path), allowlist=[], fetch=fetcher(documents, calls))
+
+    assert other("https://w3id.org/ctx")["document"] == CONTEXT
+    assert calls == ["https://w3id.org/ctx"]
+    assert other.stats["hits"] == 1
+
+
+def test_slow_fetch_does_not_block_other_documents(tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def fetch(url, options):
+        started.set()
+        release.wait(5)
+        return {"document": CONTEXT}
+
+    loader = CachedDocumentLoader(cache_dir=str(tmp_path), allowlist=["https://slow.org/ctx"], fetch=fetch)
+    slow = threading.Thread(target=loader, args=("https://slow.org/ctx",))
+    slow.start()
+    started.wait(5)
+
+    try:
+        start = time.monotonic()
+        assert "@context" in loader("https://schema.org/")["document"]
+        assert time.monotonic() - start < 1
+    finally:
+        release.set()
+        slow.join()
+    assert loader.documents["https://slow.org/ctx"] == CONTEXT
@@ -0,0 +1,84 @@
+from unittest import mock
+
+import pytest
+
+from src.core import genai_model
+from src.core.llm_cache import LLMResponseCache, llm_cache_key
+
+KEY_ARGS = ("openrouter", "google/gemini-2.5-flash", 0.1, "system prompt", {"type": "object"}, "packed repository")
+
+
+def test_cache_key_covers_every_input():
+    key = llm_cache_key(*KEY_ARGS)
+
+    assert key == llm_cache_key(*KEY_ARGS)
+    for index, other in enumerate(["openai", "gpt-4o", 0.2, "other prompt", {"type": "array"}, "other repository"]):
+        args = list(KEY_ARGS)
+        args[index] = other
+        assert llm_cache_key(*args) != key
+
+
+def openrouter_answer(content):
+    response = mock.Mock()
+    response.json.return_value = {"choices": [{"message": {"content": content}}], "usage": {"total_tokens": 42}}
+    return response
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(path=str(tmp_path / "llm.sqlite"))
+    with mock.patch.object(genai_model, "llm_cache", cache), \
+            mock.patch.object(genai_model, "PROVIDER", "openrouter"):
+        yield cache
+
+
+def test_completion_is_cached_after_parsing(cache):
+    with mock.patch.object(genai_model, "get_openrouter_response",
+                           return_value=openrouter_answer('```json\n{"name": "bar"}\n```')) as provider:
+        assert genai_model.request_llm("packed repository") == {"name": "bar"}
+        assert genai_model.request_llm("packed repository") == {"name": "bar"}
+
+    assert provider.call_count == 1
+
+
+def test_unparsable_completion_is_not_cached(cache):
+    answers = [openrouter_answer('{"name": "ba'), openrouter_answer('{"name": "bar"}')]
+    with mock.patch.object(genai_model, "get_openrouter_response", side_effect=answers) as provider:
+        with pytest.raises(ValueError):
+            genai_model.request_llm("packed repository")
+        assert genai_model.request_llm("packed repository") == {"name": "bar"}
+
+    assert provider.call_count == 2
+
+
+def test_unparsable_cache_entry_is_dropped(cache):
+    key = genai_model._completion_cache_key("packed repository")
+    cache.set(key, "not json", None)
+
+    with mock.patch.object(genai_model, "get_openrouter_response",
+                           return_value=openrouter_answer('{"name": "bar"}')) as provider:
+        assert genai_model.request_llm("packed repository") == {"name": "bar"}
+
+    assert provider.call_count == 1
+    assert cache.get(key)["content"] == '{"name": "bar"}'
+
+
+def test_truncated_stream_is_not_cached(cache):
+    def truncated(*args, **kwargs):
+        yield {"content": '{"name": ', "usage": None}
+        yield {"content": '"ba', "usage": {"total_tokens": 3}}
+
+    with mock.patch.object(genai_model, "stream_openrouter_response", side_effect=truncated):
+        assert "".join(genai_model.stream_completion("packed repository")) == '{"name": "ba'
+
+    assert cache.get(genai_model._completion_cache_key("packed repository")) is None
+
+
+def test_cache_opens_its_file_on_first_use(tmp_path):
+    path = tmp_path / "llm.sqlite"
+    cache = LLMResponseCache(path=str(path))
+    assert not path.exists()
+
+    cache.set("key", "content", None)
+    assert cache.get("key") == {"content": "content", "usage": None}
+    assert path.exists()
@@ -0,0 +1,88 @@
+import json
+
+from src.core.local_metadata import extract_local_metadata, normalize_license
+from src.core.prompts import build_system_prompt, remaining_fields, system_prompt_json
+
+
+CITATION_CFF = """
+cff-version: 1.2.0
+title: Lungs segmentation
+abstract: Segmentation of lungs in CT scans.
+authors:
+  - given-names: Ada
+    family-names: Lovelace
+    orcid: https://orcid.org/0000-0002-1825-0097
+    affiliation: EPFL
+  - name: Imaging Team
+license: MIT
+date-released: 2024-03-01
+repository-code: https://github.com/foo/lungs.git
+doi: 10.5281/zenodo.123
+"""
+
+PYPROJECT = """
+[project]
+name = "lungs-segmentation"
+description = "Short description"
+license = "Apache-2.0"
+dependencies = ["numpy>=1.24", "torch"]
+
+[project.urls]
+Homepage = "https://foo.github.io/lungs"
+Documentation = "https://foo.github.io/lungs/docs"
+"""
+
+
+def test_metadata_files_are_mapped_and_merged_by_priority(tmp_path):
+    (tmp_path / "CITATION.cff").write_text(CITATION_CFF)
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT)
+    (tmp_path / "package.json").write_text(json.dumps({"name": "lungs-ui", "license": "SEE LICENSE IN LICENSE"}))
+
+    metadata = extract_local_metadata(str(tmp_path))
+
+    assert metadata == {
+        "name": "Lungs segmentation",
+        "description": "Segmentation of lungs in CT scans.",
+        "author": [
+            {"name": "Ada Lovelace", "orcidId": "https://orcid.org/0000-0002-1825-0097", "affiliation": ["EPFL"]},
+            {"name": "Imaging Team"},
+        ],
+        "license": "https://spdx.org/licenses/MIT",
+        "datePublished": "2024-03-01",
+        "codeRepository": ["https://github.com/foo/lungs"],
+        "identifier": "10.5281/zenodo.123",
+        "url": "https://foo.github.io/lungs",
+        "hasDocumentation": "https://foo.github.io/lungs/docs",
+        "softwareRequirements": ["numpy>=1.24", "torch"],
+    }
+
+
+def test_invalid_files_are_ignored(tmp_path):
+    (tmp_path / "codemeta.json").write_text("{not json")
+    (tmp_path / "package.json").write_text(json.dumps({"name": "demo", "author": "Jane Doe <jane@example.org> (https://jane.dev)"}))
+
+    assert extract_local_metadata(str(tmp_path)) == {"author": [{"name": "Jane Doe"}]}
+
+
+def test_package_names_are_not_software_names(tmp_path):
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "lungs-seg"\ndescription = "Segment lungs"\n')
+
+    assert extract_local_metadata(str(tmp_path)) == {"description": "Segment lungs"}
+
+
+def test_unknown_licenses_are_not_guessed():
+    assert normalize_license("GPL-3.0") == "https://spdx.org/licenses/GPL-3.0-only"
+    assert normalize_license("Proprietary") is None
+    assert normalize_license({"text": "see LICENSE"}) is None
+
+
+def test_prompt_leaves_out_known_fields():
+    assert build_system_prompt() == system_prompt_json
+
+    prompt = build_system_prompt({"name", "license", "isBasedOn"})
+    assert "\n- `name`" not in prompt and "\n- `license`" not in prompt and "\n- `isBasedOn`" not in prompt
+    assert "\n- `description`" in prompt
+    assert len(prompt) < len(system_prompt_json)
+
+    assert "name" not in remaining_fields({"name"})
+    assert remaining_fields(set(remaining_fields())) == []
@@ -0,0 +1,82 @@
+import pytest
+from pydantic import ValidationError
+
+from src.core.models import (JSONLD_TYPE_MODELS, FormalParameter, Organization, Person,
+                             convert_jsonld_to_pydantic, get_conversion_plan)
+
+SDO = "http://schema.org/"
+SD = "https://w3id.org/okn/o/sd#"
+REPO = "https://github.com/foo/bar"
+
+
+def make_graph() -> list:
+    return [
+        {"@id": REPO, "@type": [SDO + "SoftwareSourceCode"],
+         SDO + "name": [{"@value": "bar"}],
+         SDO + "programmingLanguage": [{"@value": "Python"}, {"@value": "C++"}],
+         SDO + "image": [{"@id": f"{REPO}/raw/main/logo.png"}],
+         SD + "readme": [{"@id": f"{REPO}/blob/main/README.md"}],
+         SDO + "author": [{"@id": "https://github.com/alice"}, {"@id": "https://ror.org/02s376052"}],
+         SD + "hasParameter": [{"@id": "_:parameter"}],
+         SD + "hasFunding": [{"@id": "_:funding"}],
+         SD + "hasSoftwareImage": [{"@id": "_:image"}]},
+        {"@id": "https://github.com/alice", "@type": [SDO + "Person"],
+         SDO + "name": [{"@value": "Alice"}]},
+        {"@id": "https://ror.org/02s376052", "@type": [SDO + "Organization"],
+         SDO + "legalName": [{"@value": "EPFL"}]},
+        {"@id": "_:parameter", "@type": [SD + "FormalParameter"],
+         SDO + "name": [{"@value": "input"}], SD + "hasDimensionality": [{"@value": 3}]},
+        {"@id": "_:funding", "@type": [SD + "FundingInformation"],
+         SDO + "identifier": [{"@value": "200021"}], SD + "fundingGrant": [{"@value": "200021"}],
+         SD + "fundingSource": [{"@id": "_:snsf"}]},
+        {"@id": "_:snsf", "@type": [SDO + "Organization"],
+         SDO + "legalName": [{"@value": "Swiss National Science Foundation"}]},
+        {"@id": "_:image", "@type": [SD + "SoftwareImage"],
+         SDO + "name": [{"@value": "foo/bar"}], SDO + "description": [{"@value": "Docker image"}],
+         SDO + "softwareVersion": [{"@value": "1.0.0"}],
+         SD + "availableInRegistry": [{"@id": "https://hub.docker.com/r/foo/bar"}]},
+    ]
+
+
+def test_nodes_are_converted_by_type():
+    converted = convert_jsonld_to_pydantic(make_graph())
+
+    assert converted.name == "bar"
+    assert converted.programmingLanguage == ["Python", "C++"]
+    assert str(converted.image[0].contentUrl) == f"{REPO}/raw/main/logo.png"
+    assert isinstance(converted.author[0], Person) and isinstance(converted.author[1], Organization)
+    assert isinstance(converted.hasParameter[0], FormalParameter)
+    assert converted.hasParameter[0].hasDimensionality == 3
+    assert converted.hasFunding[0].fundingSource.legalName == "Swiss National Science Foundation"
+    assert converted.hasSoftwareImage[0].softwareVersion == "1.0.0"
+
+
+def test_type_precedence_and_missing_nodes():
+    graph = [
+        {"@id": "https://github.com/foo", "@type": [SDO + "Organization", SDO + "Person"],
+         SDO + "name": [{"@value": "Foo"}]},
+        {"@id": REPO, "@type": SDO + "SoftwareSourceCode",
+         SDO + "name": {"@value": "bar"},
+         SDO + "author": [{"@id": "https://github.com/foo"}, {"@id": "https://github.com/unknown"}],
+         SDO + "keywords": [{"@value": "not a model field"}]},
+    ]
+
+    converted = convert_jsonld_to_pydantic(graph)
+
+    assert converted.name == "bar"
+    assert converted.author == [Person(name="Foo", orcidId=None, affiliation=None)]
+    assert convert_jsonld_to_pydantic([]) is None
+    assert convert_jsonld_to_pydantic(graph[:1]) is None
+
+
+def test_nested_nodes_are_validated():
+    graph = make_graph()
+    graph[-1][SDO + "softwareVersion"] = [{"@value": "latest"}]
+
+    with pytest.raises(ValidationError):
+        convert_jsonld_to_pydantic(graph)
+
+
+@pytest.mark.parametrize("model", list(JSONLD_TYPE_MODELS.values()), ids=lambda model: model.__name__)
+def test_every_field_is_mapped(model):
+    assert {name for name, _ in get_conversion_plan(model).values()} == set(model.model_fields)
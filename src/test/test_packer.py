@@ -0,0 +1,210 @@
+import json
+import math
+from unittest import mock
+
+from src.core.packer import list_repository_files, pack_directory
+from src.core import pruning
+from src.core.pruning import Pruner
+from src.core.tokens import TokenBudget
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+
+
+def make_repo(root):
+    write(root / ".gitignore", "build/\n*.log\n!keep.log\n/data\n")
+    write(root / "README.md", "# Demo\n")
+    write(root / "main.py", "print('hi')\n")
+    write(root / "setup.cfg", "[metadata]\n")
+    write(root / "debug.log", "noise\n")
+    write(root / "keep.log", "kept\n")
+    write(root / "build" / "out.py", "generated\n")
+    write(root / "data" / "x.csv", "1,2\n")
+    write(root / "src" / "data" / "y.py", "nested data is kept\n")
+    write(root / "src" / ".gitignore", "*.tmp\n")
+    write(root / "src" / "a.tmp", "tmp\n")
+    write(root / "logo.png", b"\x89PNG\r\n\x1a\n\0\0\0")
+    write(root / ".git" / "HEAD", "ref: refs/heads/main\n")
+
+
+def test_gitignore_and_binaries(tmp_path):
+    make_repo(tmp_path)
+    files = set(list_repository_files(str(tmp_path)))
+
+    assert files == {
+        ".gitignore", "README.md", "main.py", "setup.cfg", "keep.log",
+        "src/.gitignore", "src/data/y.py",
+    }
+
+
+def test_pack_orders_documentation_first(tmp_path):
+    make_repo(tmp_path)
+    text = pack_directory(str(tmp_path))
+
+    assert text.index('<content full_path="README.md">') < text.index('<content full_path="main.py">')
+    assert text.index('<content full_path="main.py">') < text.index('<content full_path="setup.cfg">')
+    assert "# Demo" in text
+
+
+class CharEncoder:
+    """One token per character, avoids downloading a real tiktoken encoding."""
+
+    def encode(self, text, disallowed_special=()):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+def test_budget_accepts_small_texts_without_encoding():
+    budget = TokenBudget(1000, encoder=None)
+    assert budget.take("a" * 100) == "a" * 100
+    assert budget.used == 25
+
+
+def test_budget_truncates_at_the_limit():
+    budget = TokenBudget(100, encoder=CharEncoder())
+    budget.take("a" * 50)
+    # The estimate of the first text is replaced with its exact count before truncating
+    assert budget.take("b" * 200) == "b" * 50
+    assert budget.used == 100
+    assert budget.exhausted
+    assert budget.take("c") == ""
+
+
+def test_pack_stops_reading_when_budget_is_exhausted(tmp_path):
+    make_repo(tmp_path)
+    write(tmp_path / "AAA.md", "x" * 5000)
+    budget = TokenBudget(300, encoder=CharEncoder())
+    text = pack_directory(str(tmp_path), budget=budget)
+
+    assert budget.exhausted
+    assert '<content full_path="AAA.md">' in text
+    assert '<content full_path="README.md">' not in text
+    assert text.count("x") < 300
+
+
+class PairEncoder(CharEncoder):
+    """One token per two characters, the densest ratio the budget assumes for ASCII text."""
+
+    def encode(self, text, disallowed_special=()):
+        return [text[i:i + 2] for i in range(0, len(text), 2)]
+
+
+def test_packed_text_stays_within_budget(tmp_path):
+    make_repo(tmp_path)
+    for i in range(20):
+        write(tmp_path / f"data{i:02d}.txt", "QUJD" * 200)
+    budget = TokenBudget(1000, encoder=PairEncoder())
+    text = pack_directory(str(tmp_path), budget=budget)
+
+    assert budget.exhausted
+    assert len(PairEncoder().encode(text)) <= 1000
+    # The truncated file is still closed
+    assert text.endswith("</content>\n")
+    assert text.count("<content ") == text.count("</content>")
+
+
+class QuadEncoder(CharEncoder):
+    """One token per four characters, the usual ratio of prose and code."""
+
+    def encode(self, text, disallowed_special=()):
+        return [text[i:i + 4] for i in range(0, len(text), 4)]
+
+
+def test_budget_is_filled_at_the_usual_ratio(tmp_path):
+    make_repo(tmp_path)
+    for i in range(20):
+        write(tmp_path / f"data{i:02d}.txt", "QUJD" * 200)
+    budget = TokenBudget(1000, encoder=QuadEncoder())
+    text = pack_directory(str(tmp_path), budget=budget)
+
+    assert 950 <= len(QuadEncoder().encode(text)) <= 1000
+
+
+def test_pruning_drops_noise_and_reports_savings(tmp_path):
+    notebook = {
+        "cells": [
+            {"cell_type": "markdown", "source": ["# Analysis\n"], "metadata": {}},
+            {"cell_type": "code", "source": ["plot()"], "execution_count": 1, "metadata": {},
+             "outputs": [{"output_type": "display_data", "data": {"image/png": "iVBORw0KGgo" * 500}}]},
+        ],
+        "metadata": {}, "nbformat": 4, "nbformat_minor": 5,
+    }
+    write(tmp_path / "README.md", "# Demo\n" + "A long paragraph. " * 100 + "\n")
+    write(tmp_path / "main.py", "print('hi')\n")
+    write(tmp_path / "copy" / "main.py", "print('hi')\n")
+    write(tmp_path / "analysis.ipynb", json.dumps(notebook))
+    write(tmp_path / "poetry.lock", "[[package]]\n" * 100)
+    write(tmp_path / "static" / "app.js", "var a=1;" * 500)
+    write(tmp_path / "api_pb2.py", "# Generated by the protocol buffer compiler.\n")
+    write(tmp_path / "models.py", "# Code generated by sqlc. DO NOT EDIT.\nx = 1\n")
+    write(tmp_path / "node_modules" / "lib" / "index.js", "module.exports = 1;\n")
+
+    pruner = Pruner()
+    packed = pack_directory(str(tmp_path), pruner=pruner)
+
+    assert "A long paragraph." in packed
+    assert '<content full_path="copy/main.py">' in packed
+    assert '<content full_path="main.py">' not in packed
+    assert "# %% [code]\nplot()" in packed and "iVBORw0KGgo" not in packed
+    for pruned in ("poetry.lock", "static/app.js", "api_pb2.py", "models.py", "node_modules"):
+        assert f'<content full_path="{pruned}' not in packed
+    assert "node_modules" not in packed
+
+    report = pruner.report.as_dict()
+    assert report["pruned"] == {
+        "duplicate": 1, "notebook outputs": 1, "lock file": 1, "minified": 1, "generated": 2, "vendored": 1,
+    }
+    assert report["bytes_saved"] > 4000
+    assert report["tokens_saved"] == math.ceil(report["bytes_saved"] / 4)
+
+
+def test_pruned_files_are_left_out_of_the_file_list(tmp_path):
+    codemeta = {"name": "bar", "description": "A tool " * 200, "keywords": ["imaging"] * 50}
+    write(tmp_path / "codemeta.json", json.dumps(codemeta))
+    write(tmp_path / "static" / "app.js", "var a=1;" * 500)
+    write(tmp_path / "main.py", "print('hi')\n")
+    write(tmp_path / "copy" / "main.py", "print('hi')\n")
+
+    packed = pack_directory(str(tmp_path), pruner=Pruner())
+    listing = packed.split("\n\n", 1)[0].splitlines()[1:]
+
+    assert listing == ["copy/main.py", "codemeta.json"]
+    # Compact metadata files are not mistaken for minified code
+    assert '<content full_path="codemeta.json">' in packed
+
+
+def test_duplicates_are_detected_on_the_whole_file(tmp_path):
+    shared = "x = 1\n" * 2000
+    write(tmp_path / "a.py", shared + "a = 1\n")
+    write(tmp_path / "b.py", shared + "b = 2\n")
+    budget = TokenBudget(100, encoder=CharEncoder())
+
+    pruner = Pruner()
+    packed = pack_directory(str(tmp_path), budget=budget, pruner=pruner)
+
+    assert "duplicate" not in pruner.report.pruned
+    assert packed.startswith("Directory Structure:\na.py\nb.py\n")
+
+
+def test_files_past_the_budget_are_listed_without_being_read(tmp_path):
+    for i in range(10):
+        write(tmp_path / f"file{i}.py", f"x = {i}\n" * 250)
+    write(tmp_path / "poetry.lock", "[[package]]\n")
+    budget = TokenBudget(300, encoder=CharEncoder())
+
+    pruner = Pruner()
+    with mock.patch.object(pruner, "prune", wraps=pruner.prune) as prune, \
+            mock.patch("src.core.pruning._file_digest", wraps=pruning._file_digest) as digest:
+        packed = pack_directory(str(tmp_path), budget=budget, pruner=pruner)
+
+    assert packed.startswith("Directory Structure:\n" + "".join(f"file{i}.py\n" for i in range(10)) + "\n")
+    assert [call.args[0] for call in prune.call_args_list] == ["file0.py", "file1.py"]
+    # Only the truncated file is hashed from disk
+    assert digest.call_count == 1
@@ -0,0 +1,30 @@
+import copy
+import json
+
+import pytest
+
+from src.core.registry import get_registry, pruned_response_schema
+
+
+def test_static_artifacts_are_read_only():
+    registry = get_registry()
+
+    with pytest.raises(TypeError):
+        registry.response_schema["properties"]["name"] = {}
+    with pytest.raises(TypeError):
+        registry.response_schema["properties"]["name"]["anyOf"].append({"type": "integer"})
+    with pytest.raises(TypeError):
+        registry.jsonld_context["@context"].update({"name": "http://example.org/name"})
+    with pytest.raises(TypeError):
+        pruned_response_schema(frozenset({"name"}))["properties"].pop("description")
+
+
+def test_frozen_documents_serialize_and_copy_as_plain_json():
+    schema = get_registry().response_schema
+
+    assert json.loads(json.dumps(schema)) == schema
+    copied = copy.deepcopy(schema)
+    copied["properties"]["name"] = {}
+    copied["properties"]["description"]["anyOf"].append({"type": "integer"})
+    assert schema["properties"]["name"] != {}
+    assert {"type": "integer"} not in schema["properties"]["description"]["anyOf"]
@@ -0,0 +1,115 @@
+import os
+import subprocess
+from unittest import mock
+
+import pytest
+
+from src.core import repo_cache
+from src.core.repo_cache import MirrorCache
+
+GIT_ENV = {"GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@example.org",
+           "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@example.org"}
+
+
+def commit(repo, name, content):
+    (repo / name).write_text(content)
+    env = {**os.environ, **GIT_ENV}
+    subprocess.run(["git", "-C", str(repo), "add", name], check=True, env=env)
+    subprocess.run(["git", "-C", str(repo), "commit", "--quiet", "-m", name], check=True, env=env)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    repo = tmp_path / "upstream"
+    subprocess.run(["git", "init", "--quiet", str(repo)], check=True)
+    commit(repo, "README.md", "# Demo\n")
+    return repo
+
+
+def test_cache_root_is_created_on_first_checkout(tmp_path):
+    cache = MirrorCache(root=str(tmp_path / "mirrors"))
+
+    assert not os.path.exists(cache.root)
+    assert cache.evict() == 0
+
+
+def test_second_checkout_fetches_into_the_mirror(tmp_path, upstream):
+    cache = MirrorCache(root=str(tmp_path / "mirrors"))
+    cache.checkout(str(upstream), str(tmp_path / "first"))
+    commit(upstream, "main.py", "print('hi')\n")
+
+    with mock.patch.object(repo_cache.subprocess, "run", wraps=subprocess.run) as run:
+        cache.checkout(str(upstream), str(tmp_path / "second"))
+
+    commands = [call.args[0] for call in run.call_args_list]
+    assert any("fetch" in command for command in commands)
+    assert not any("clone" in command and "--bare" in command for command in commands)
+    assert (tmp_path / "second" / "main.py").exists()
+    assert not (tmp_path / "first" / "main.py").exists()
+
+
+def test_mirror_skips_pull_request_refs(tmp_path, upstream):
+    subprocess.run(["git", "-C", str(upstream), "update-ref", "refs/pull/1/head", "HEAD"], check=True)
+    subprocess.run(["git", "-C", str(upstream), "tag", "v1"], check=True)
+    cache = MirrorCache(root=str(tmp_path / "mirrors"))
+    mirror = cache.mirror_path(str(upstream))
+    subprocess.run(["git", "clone", "--mirror", "--quiet", str(upstream), mirror], check=True)
+
+    cache.checkout(str(upstream), str(tmp_path / "first"))
+    commit(upstream, "main.py", "print('hi')\n")
+    subprocess.run(["git", "-C", str(upstream), "tag", "v2"], check=True)
+    cache.checkout(str(upstream), str(tmp_path / "second"))
+
+    refs = subprocess.run(["git", "--git-dir", mirror, "for-each-ref", "--format=%(refname)"],
+                          check=True, capture_output=True, text=True).stdout.split()
+    assert "refs/tags/v1" in refs and "refs/tags/v2" in refs
+    assert not any(ref.startswith("refs/pull/") for ref in refs)
+    assert (tmp_path / "second" / "main.py").exists()
+
+
+def test_locked_mirror_is_not_acquired_twice(tmp_path):
+    cache = MirrorCache(root=str(tmp_path))
+    path = str(tmp_path / "a.git")
+
+    with cache._locked(path) as held:
+        with cache._locked(path, blocking=False) as acquired:
+            assert held and not acquired
+    with cache._locked(path, blocking=False) as acquired:
+        assert acquired
+
+
+def make_mirror(root, name, size, mtime):
+    path = root / name
+    path.mkdir(parents=True)
+    (path / "pack").write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_least_recently_used_mirrors_are_evicted(tmp_path):
+    cache = MirrorCache(root=str(tmp_path), max_bytes=2500)
+    old = make_mirror(tmp_path, "old.git", 1000, 100)
+    busy = make_mirror(tmp_path, "busy.git", 1000, 200)
+    recent = make_mirror(tmp_path, "recent.git", 1000, 300)
+    newest = make_mirror(tmp_path, "newest.git", 1000, 400)
+
+    with cache._locked(busy):
+        assert cache.evict() == 2
+
+    assert not os.path.exists(old) and not os.path.exists(old + ".size")
+    assert os.path.exists(busy) and os.path.exists(newest)
+    assert not os.path.exists(recent)
+
+
+def test_eviction_uses_the_recorded_sizes(tmp_path):
+    cache = MirrorCache(root=str(tmp_path), max_bytes=1500)
+    make_mirror(tmp_path, "a.git", 1000, 100)
+    make_mirror(tmp_path, "b.git", 1000, 200)
+    cache._write_size(str(tmp_path / "a.git"), 100)
+
+    with mock.patch.object(repo_cache, "_directory_size", wraps=repo_cache._directory_size) as measure:
+        assert cache.evict() == 0
+        assert cache.evict() == 0
+
+    # Only the mirror without a recorded size is measured, once
+    assert measure.call_count == 1
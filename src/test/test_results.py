@@ -0,0 +1,111 @@
+import threading
+import time
+from unittest import mock
+
+from src.core.results import ExtractionResult, ResultMemory
+
+GRAPH = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {"@id": "https://github.com/foo/bar", "@type": ["http://schema.org/SoftwareSourceCode"],
+         "http://schema.org/name": [{"@value": "bar"}],
+         "http://schema.org/license": [{"@id": "https://spdx.org/licenses/MIT"}]},
+    ],
+}
+
+
+def test_formats_are_rendered_once():
+    result = ExtractionResult("https://github.com/foo/bar", GRAPH, "a" * 40)
+
+    assert result.render("json-ld") is GRAPH
+
+    with mock.patch("src.core.results.convert_pydantic_to_zod_form_dict", return_value={"schema:name": "bar"}) as convert:
+        assert result.render("json") == {"schema:name": "bar"}
+        assert result.render("json") == {"schema:name": "bar"}
+    assert convert.call_count == 1
+
+    turtle = result.render("turtle")
+    assert "<https://github.com/foo/bar>" in turtle and '"bar"' in turtle
+    assert result.render("turtle") is turtle
+
+
+def test_memory_evicts_least_recently_used():
+    memory = ResultMemory(max_size=2)
+    results = [ExtractionResult(str(i), GRAPH) for i in range(3)]
+
+    memory.set(("a",), results[0])
+    memory.set(("b",), results[1])
+    memory.get(("a",))
+    memory.set(("c",), results[2])
+
+    assert memory.get(("a",)) is results[0]
+    assert memory.get(("b",)) is None
+
+
+def test_concurrent_requests_share_the_failure_of_one_extraction():
+    from src.core import pipeline
+
+    calls = []
+
+    def failing_pipeline(full_path, commit_sha, on_stage):
+        calls.append(full_path)
+        time.sleep(0.2)
+        raise pipeline.LLMServiceError("provider down")
+
+    errors = []
+
+    def request():
+        try:
+            pipeline.extract_result("https://github.com/foo/failing")
+        except pipeline.LLMServiceError as e:
+            errors.append(e)
+
+    with mock.patch.object(pipeline, "resolve_head_sha", return_value="b" * 40), \
+            mock.patch.object(pipeline.result_cache, "get", return_value=None), \
+            mock.patch.object(pipeline, "_run_pipeline", side_effect=failing_pipeline):
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(calls) == 1
+    assert len(errors) == 4
+
+
+def test_missing_git_does_not_break_head_resolution():
+    from src.core import result_cache
+
+    with mock.patch.object(result_cache.subprocess, "run", side_effect=FileNotFoundError("git")):
+        assert result_cache.resolve_head_sha("https://github.com/foo/no-git") is None
+
+
+def test_result_cache_opens_its_file_on_first_use(tmp_path):
+    from src.core.result_cache import ResultCache
+
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"))
+    assert not (tmp_path / "results.sqlite").exists()
+
+    assert cache.get("https://github.com/foo/bar", "a" * 40, "model") is None
+    assert (tmp_path / "results.sqlite").exists()
+
+
+def test_results_are_cached_under_the_checked_out_commit(tmp_path):
+    from src.core import pipeline
+    from src.core.result_cache import ResultCache
+
+    stages = mock.Mock()
+    stages.run.return_value = {"clone": str(tmp_path), "gimie_fields": frozenset(), "merge": GRAPH, "jsonld": {"name": "bar"}}
+    cache = ResultCache(path=str(tmp_path / "results.sqlite"))
+
+    # A commit was pushed between resolving HEAD and cloning
+    with mock.patch.object(pipeline, "result_cache", cache), \
+            mock.patch.object(pipeline, "resolve_head_sha", return_value="b" * 40), \
+            mock.patch.object(pipeline, "checkout_head_sha", return_value="c" * 40), \
+            mock.patch.object(pipeline, "build_extraction_graph", return_value=stages):
+        result = pipeline.extract_result("https://github.com/foo/pushed")
+
+    assert result.commit_sha == "c" * 40
+    assert cache.get("https://github.com/foo/pushed", "c" * 40, pipeline.MODEL) == GRAPH
+    assert cache.get("https://github.com/foo/pushed", "b" * 40, pipeline.MODEL) is None
+    assert cache.get_latest("https://github.com/foo/pushed", pipeline.MODEL)["commit"] == "c" * 40
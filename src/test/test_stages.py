@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from src.core.stages import StageGraph, StageError
+
+
+def test_independent_stages_run_concurrently():
+    graph = StageGraph()
+    graph.add("a", lambda r: time.sleep(0.3) or "a")
+    graph.add("b", lambda r: time.sleep(0.3) or "b")
+    graph.add("c", lambda r: r["a"] + r["b"], after=["a", "b"])
+
+    start = time.time()
+    results = graph.run()
+
+    assert results["c"] == "ab"
+    assert time.time() - start < 0.55
+
+
+def test_failure_reports_stage():
+    graph = StageGraph()
+    graph.add("a", lambda r: 1 / 0)
+    graph.add("b", lambda r: r["a"], after=["a"])
+
+    with pytest.raises(StageError) as excinfo:
+        graph.run()
+
+    assert excinfo.value.stage == "a"
+    assert isinstance(excinfo.value.error, ZeroDivisionError)
+
+
+def test_failure_does_not_wait_for_running_stages():
+    graph = StageGraph()
+    graph.add("slow", lambda r: time.sleep(1) or "slow")
+    graph.add("failing", lambda r: 1 / 0)
+
+    start = time.time()
+    with pytest.raises(StageError) as excinfo:
+        graph.run()
+
+    assert excinfo.value.stage == "failing"
+    assert time.time() - start < 0.5
+
+
+def test_unknown_dependency():
+    graph = StageGraph()
+    with pytest.raises(ValueError):
+        graph.add("b", lambda r: None, after=["a"])
+
+
+def test_conditional_stages_are_skipped():
+    statuses = []
+    graph = StageGraph()
+    graph.add("check", lambda r: False)
+    graph.add("expensive", lambda r: "ran", after=["check"], when=lambda r: r["check"])
+    graph.add("after", lambda r: r["expensive"] or "fallback", after=["expensive"])
+
+    results = graph.run(lambda stage, status: statuses.append((stage, status)))
+
+    assert results["expensive"] is None
+    assert results["after"] == "fallback"
+    assert ("expensive", "skipped") in statuses
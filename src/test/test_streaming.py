@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from src.core.streaming import IncrementalJSONParser
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalJSONParser()
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(parser.feed(text[i:i + size]))
+    return parser, members
+
+
+def test_members_are_emitted_as_they_complete():
+    document = {
+        "name": "demo, \"quoted\" {not} [nested]",
+        "author": [{"name": "A", "orcid": None}],
+        "keywords": ["a", "b"],
+        "isPluginModuleOf": [],
+    }
+    text = "```json\n" + json.dumps(document, indent=2) + "\n```"
+
+    for size in (1, 3, 17, len(text)):
+        parser, members = feed_in_chunks(text, size)
+        assert members == list(document.items())
+        assert parser.result() == document
+
+
+def test_malformed_output_raises_early():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"name": "demo", ') == [("name", "demo")]
+
+    with pytest.raises(ValueError):
+        parser.feed('"description": oops, ')
+
+
+def test_text_before_the_object_is_rejected():
+    with pytest.raises(ValueError):
+        IncrementalJSONParser().feed("Sure! Here is the metadata: {")
+
+
+def test_incomplete_object_has_no_result():
+    parser = IncrementalJSONParser()
+    parser.feed('{"name": "demo"')
+
+    with pytest.raises(ValueError):
+        parser.result()
@@ -0,0 +1,119 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from src.core import verification
+from src.core.url_cache import UrlStatusCache
+from src.core.verification import Verification
+
+
+@pytest.fixture
+def url_cache():
+    cache = UrlStatusCache(path=None)
+    with mock.patch.object(verification, "url_status_cache", cache):
+        yield cache
+
+
+def test_probes_finishing_after_the_deadline_are_not_cached(url_cache):
+    def probe(url):
+        time.sleep(0.3 if "slow" in url else 0)
+        return True
+
+    check = Verification({})
+    with mock.patch.object(check, "_probe_url", side_effect=probe):
+        results = check._check_urls(["https://slow.org/", "https://fast.org/"], deadline=0.1)
+        time.sleep(0.4)
+
+    assert results == {"https://slow.org/": False, "https://fast.org/": True}
+    assert url_cache.get("https://fast.org/") is True
+    assert url_cache.get("https://slow.org/") is None
+
+
+def test_latency_of_the_checked_hosts_is_logged(url_cache, caplog):
+    url_cache.record_latency("other.org", 5.0)
+    check = Verification({})
+
+    with mock.patch.object(check, "_probe_url", side_effect=lambda url: time.sleep(0.05) or True), \
+            caplog.at_level("INFO", logger=verification.__name__):
+        check._check_urls(["https://example.org/a", "https://example.org/b"])
+
+    assert 0.05 <= url_cache.latency_stats()["example.org"] < 1
+    assert list(url_cache.latency_stats(["example.org", "missing.org"])) == ["example.org"]
+    message = next(r.message for r in caplog.records if "latency" in r.message)
+    assert "example.org" in message and "other.org" not in message
+
+
+def test_each_distinct_url_is_checked_once(url_cache):
+    check = Verification({
+        "url": "https://example.org/",
+        "readme": "https://example.org/README.md",
+        "codeRepository": ["https://example.org/", "https://github.com/foo/bar"],
+        "citation": ["https://example.org/README.md"],
+    })
+
+    with mock.patch.object(check, "_probe_url", return_value=True) as probe:
+        check._check_url_accessibility()
+
+    assert sorted(call.args[0] for call in probe.call_args_list) == [
+        "https://example.org/", "https://example.org/README.md", "https://github.com/foo/bar",
+    ]
+
+
+def test_requests_per_host_are_capped(url_cache):
+    running = {"example.org": 0, "other.org": 0}
+    peak = dict(running)
+    lock = threading.Lock()
+
+    def probe(url):
+        host = url.split("/")[2]
+        with lock:
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+        time.sleep(0.05)
+        with lock:
+            running[host] -= 1
+        return True
+
+    urls = [f"https://example.org/{i}" for i in range(8)] + [f"https://other.org/{i}" for i in range(2)]
+    check = Verification({})
+    with mock.patch.object(verification, "URL_CHECK_PER_HOST", 2), \
+            mock.patch.object(check, "_probe_url", side_effect=probe):
+        assert all(check._check_urls(urls).values())
+
+    assert peak == {"example.org": 2, "other.org": 2}
+
+
+def test_head_rejections_fall_back_to_get():
+    check = Verification({})
+    get = mock.MagicMock()
+    get.return_value.__enter__.return_value = mock.Mock(status_code=200)
+
+    with mock.patch.object(verification._session, "head", return_value=mock.Mock(status_code=405)), \
+            mock.patch.object(verification._session, "get", get):
+        assert check._probe_url("https://example.org/") is True
+    assert get.call_args.kwargs["stream"] is True
+
+    with mock.patch.object(verification._session, "head", return_value=mock.Mock(status_code=404)), \
+            mock.patch.object(verification._session, "get", get):
+        assert check._probe_url("https://example.org/missing") is False
+    assert get.call_count == 1
+
+
+def test_pending_urls_are_unreachable_at_the_deadline(url_cache):
+    release = threading.Event()
+
+    def probe(url):
+        if "slow" in url:
+            release.wait(5)
+        return True
+
+    check = Verification({})
+    start = time.monotonic()
+    with mock.patch.object(check, "_probe_url", side_effect=probe):
+        results = check._check_urls(["https://slow.org/a", "https://fast.org/"], deadline=0.2)
+    release.set()
+
+    assert time.monotonic() - start < 1
+    assert results == {"https://slow.org/a": False, "https://fast.org/": True}
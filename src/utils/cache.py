@@ -0,0 +1,114 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from contextlib import closing
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Root folder for every on-disk cache of the extractor
+CACHE_DIR = os.environ.get(
+    "CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "git-metadata-extractor")
+)
+
+
+class DiskCache:
+    """
+    Small SQLite-backed key/value store holding JSON payloads.
+
+    Entries older than `max_age` seconds are dropped, and the least recently
+    used entries are evicted once the stored payloads exceed `max_bytes`.
+    SQLite handles the locking, so several workers can share the same file.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, max_age: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the payload stored under `key`, or None if missing or expired."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            if self.max_age is not None and now - created_at > self.max_age:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable payload under `key` and enforce the budget."""
+        serialized = json.dumps(value)
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, serialized, len(serialized), now, now),
+            )
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under `max_bytes`."""
+        removed = 0
+        with self._lock, closing(self._connect()) as conn, conn:
+            if self.max_age is not None:
+                removed += conn.execute(
+                    "DELETE FROM entries WHERE created_at < ?", (time.time() - self.max_age,)
+                ).rowcount
+
+            if self.max_bytes is not None:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > self.max_bytes:
+                    rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall()
+                    stale = []
+                    for key, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        stale.append((key,))
+                        total -= size
+                    conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+                    removed += len(stale)
+
+        if removed:
+            logger.info(f"Evicted {removed} entries from cache {self.path}")
+        return removed
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import threading
+import logging
+from typing import Dict, Iterable, Optional
+
+from pyld import jsonld
+from pyld.jsonld import JsonLdError
+
+from .cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+CONTEXTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "files", "contexts")
+JSONLD_CONTEXT_CACHE_DIR = os.environ.get("JSONLD_CONTEXT_CACHE_DIR", os.path.join(CACHE_DIR, "contexts"))
+# Comma-separated URLs that may be fetched from the network once, then served from the disk cache
+JSONLD_CONTEXT_ALLOWLIST = [
+    url.strip() for url in os.environ.get("JSONLD_CONTEXT_ALLOWLIST", "").split(",") if url.strip()
+]
+
+# Remote contexts served from files bundled with the package.
+# schemaorg.jsonld only declares schema.org as vocabulary, which is what the
+# LLM output relies on; it is not a copy of the full schema.org context.
+BUNDLED_CONTEXTS = {
+    "http://schema.org": "schemaorg.jsonld",
+    "http://schema.org/": "schemaorg.jsonld",
+    "https://schema.org": "schemaorg.jsonld",
+    "https://schema.org/": "schemaorg.jsonld",
+    "https://schema.org/docs/jsonldcontext.jsonld": "schemaorg.jsonld",
+    "http://schema.org/docs/jsonldcontext.jsonld": "schemaorg.jsonld",
+}
+
+
+class CachedDocumentLoader:
+    """
+    PyLD document loader that never reaches the network for known contexts.
+
+    Documents are looked up in memory, then among the bundled contexts, then
+    in the on-disk cache. Only URLs from the allow-list are fetched remotely,
+    after which they are cached on disk. `stats` counts hits and misses.
+    Each URL has its own lock, so a slow fetch only holds up the requests for
+    the same document.
+    """
+
+    def __init__(self, bundled: Dict[str, str] = BUNDLED_CONTEXTS,
+                 cache_dir: Optional[str] = JSONLD_CONTEXT_CACHE_DIR,
+                 allowlist: Iterable[str] = JSONLD_CONTEXT_ALLOWLIST,
+                 fetch=None):
+        self.bundled = dict(bundled)
+        self.cache_dir = cache_dir
+        self.allowlist = set(allowlist)
+        self.fetch = fetch or jsonld.requests_document_loader(timeout=10)
+        self.documents: Dict[str, dict] = {}
+        self.stats = {"hits": 0, "misses": 0, "rejected": 0}
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".jsonld")
+
+    def _load_local(self, url: str) -> Optional[dict]:
+        if url in self.bundled:
+            with open(os.path.join(CONTEXTS_DIR, self.bundled[url]), encoding="utf-8") as f:
+                return json.load(f)
+
+        if self.cache_dir and os.path.exists(self._cache_path(url)):
+            with open(self._cache_path(url), encoding="utf-8") as f:
+                return json.load(f)
+
+        return None
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _fetch_remote(self, url: str, options: dict) -> dict:
+        if url not in self.allowlist:
+            self._count("rejected")
+            raise JsonLdError(
+                f"Remote JSON-LD document {url} is neither bundled nor allow-listed.",
+                "jsonld.LoadDocumentError", {"url": url},
+                code="loading remote context failed")
+
+        self._count("misses")
+        logger.info(f"JSON-LD document cache miss, fetching {url}")
+        document = self.fetch(url, options)["document"]
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Written aside then renamed, so that other workers never read a partial file
+            partial = f"{self._cache_path(url)}.{os.getpid()}.{threading.get_ident()}.partial"
+            with open(partial, "w", encoding="utf-8") as f:
+                json.dump(document, f)
+            os.replace(partial, self._cache_path(url))
+
+        return document
+
+    def __call__(self, url: str, options: Optional[dict] = None) -> dict:
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+
+        with url_lock:
+            document = self.documents.get(url)
+            if document is not None:
+                self._count("hits")
+            else:
+                document = self._load_local(url)
+                if document is not None:
+                    self._count("hits")
+                else:
+                    document = self._fetch_remote(url, options or {})
+                self.documents[url] = document
+
+        return {
+            "contentType": "application/ld+json",
+            "contextUrl": None,
+            "documentUrl": url,
+            "document": document,
+        }
+
+
+document_loader = CachedDocumentLoader()
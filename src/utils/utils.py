@@ -1,22 +1,81 @@
 import json
 import requests
 from pyld import jsonld
-from rdflib import Graph
-import ast
+from rdflib import BNode, Graph, Literal, RDF, URIRef, XSD
 import logging
 from pprint import pprint
+from urllib.parse import urlparse
+
+from .jsonld_loader import document_loader
+from .http import http_client
 
 logger = logging.getLogger(__name__)
 
 def fetch_jsonld(url):
-    """Fetch JSON-LD data from a given URL."""
+    """
+    Fetch the GIMIE JSON-LD graph from a remote endpoint answering like `/v1/gimie`
+    ({"link": ..., "output": [...]}). An `output` sent as a JSON string is decoded as well.
+    """
     headers = {"Accept": "application/ld+json"}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return ast.literal_eval(response.json().get("output", "{}"))
-    else:
-        raise Exception(f"Error fetching data: {response.status_code} - {response.text}")
+    try:
+        response = http_client.get(url, headers=headers)
+    except requests.HTTPError as e:
+        raise Exception(f"Error fetching data: {e.response.status_code} - {e.response.text}") from e
+
+    output = json.loads(response.content).get("output", [])
+    if isinstance(output, str):
+        output = json.loads(output)
+    return output
     
+def normalize_repo_url(url: str) -> str:
+    """
+    Normalize a repository URL so that trivially different spellings share a cache entry.
+
+    >>> normalize_repo_url("HTTPS://GitHub.com/Foo/Bar.git/")
+    'https://github.com/Foo/Bar'
+    """
+    parsed = urlparse(url.strip())
+    path = parsed.path.rstrip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}"
+
+# Datatypes rdflib's JSON-LD serializer emits as native JSON values
+NATIVE_LITERAL_TYPES = {XSD.boolean, XSD.integer, XSD.double, XSD.string}
+
+def _jsonld_term(term) -> dict:
+    if isinstance(term, Literal):
+        if term.datatype in NATIVE_LITERAL_TYPES:
+            return {"@value": term.toPython()}
+        if term.datatype:
+            return {"@type": str(term.datatype), "@value": str(term)}
+        if term.language:
+            return {"@language": term.language, "@value": str(term)}
+        return {"@value": str(term)}
+    return {"@id": term.n3() if isinstance(term, BNode) else str(term)}
+
+def graph_to_jsonld(graph: Graph) -> list:
+    """
+    Expanded JSON-LD node list of an rdflib graph, as `json.loads(graph.serialize(format="json-ld"))`
+    would give, built in a single pass over the triples instead of a serialize/parse round trip.
+    Graphs holding RDF collections fall back to the rdflib serializer, which renders them as @list.
+    """
+    if (None, RDF.first, None) in graph:
+        return json.loads(graph.serialize(format="json-ld"))
+
+    nodes = {}
+    for s, p, o in graph:
+        node_id = s.n3() if isinstance(s, BNode) else str(s)
+        node = nodes.get(node_id)
+        if node is None:
+            node = nodes[node_id] = {"@id": node_id}
+        if p == RDF.type:
+            node.setdefault("@type", []).append(str(o) if isinstance(o, URIRef) else _jsonld_term(o))
+        else:
+            node.setdefault(str(p), []).append(_jsonld_term(o))
+
+    return list(nodes.values())
+
 def clean_json_string(raw_text):
     """Remove triple backticks and 'json' from the response."""
     if raw_text.startswith("```json"):
@@ -26,12 +85,9 @@ def clean_json_string(raw_text):
 
     return raw_text.strip()
 
-def json_to_jsonLD(json_data, file_path): 
-    """Convert json to jsonLD using context file. Returns a jsonLD dictionary"""
-    with open(file_path) as context:
-        context_data = json.load(context)
-
-    expanded_data = jsonld.expand({**context_data, **json_data})
+def json_to_jsonLD(json_data, context_data): 
+    """Convert json to jsonLD using the parsed context file. Returns a jsonLD dictionary"""
+    expanded_data = jsonld.expand({**context_data, **json_data}, {"documentLoader": document_loader})
 
     return expanded_data[0]
 